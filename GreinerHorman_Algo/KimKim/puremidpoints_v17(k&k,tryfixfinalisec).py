@@ -46,7 +46,8 @@ You should have received the README file along with this program.
 If not, see <https://github.com/helderco/polyclip>
 """
 
-
+from array import array
+from collections import deque
 
 DEBUG = False
 
@@ -56,6 +57,8 @@ class Vertex(object):
 
     This class is almost exactly as described in the paper by Günther/Greiner.
     """
+    __slots__ = ("x", "y", "next", "prev", "neighbour", "entry", "alpha",
+                 "intersect", "checked", "couple", "cross_change", "orig")
 
     def __init__(self, vertex, alpha=0.0, intersect=False, entry=None, checked=False, degen=False, orig=True):
         if isinstance(vertex, Vertex):
@@ -90,7 +93,7 @@ class Vertex(object):
 
     def copy(self):
         copy = Vertex(self)     # point coordinates of the vertex
-        copy.next = self.__next__        # reference to the next vertex of the polygon
+        copy.next = self.next        # reference to the next vertex of the polygon
         copy.prev = self.prev            # reference to the previous vertex of the polygon
         copy.neighbour = self.neighbour       # reference to the corresponding intersection vertex in the other polygon
         copy.entry = self.entry          # True if intersection is an entry point, False if exit
@@ -117,9 +120,11 @@ class Polygon(object):
     """Manages a circular doubly linked list of Vertex objects that represents a polygon."""
 
     first = None
+    _prepared = None
 
     def add(self, vertex):
         """Add a vertex object to the polygon (vertex is added at the 'end' of the list")."""
+        self._prepared = None
         if not self.first:
             self.first = vertex
             self.first.next = vertex
@@ -135,6 +140,7 @@ class Polygon(object):
     def replace(self, old, new):
         # when replacing old normal vertice with new intersection vertice at same xy
         # only changes the attributes in place
+        self._prepared = None
         old.intersect = new.intersect
         old.x,old.y = new.x,new.y
         old.neighbour = new.neighbour
@@ -160,6 +166,7 @@ class Polygon(object):
         between the two vertices, then the new vertex is inserted based on
         its alpha value.
         """
+        self._prepared = None
         if vertex.xy == start.xy:
             copy = vertex.copy()
             self.replace(start, copy)
@@ -173,7 +180,7 @@ class Polygon(object):
         # position based on alpha
         curr = start
         while curr != end and curr.alpha < vertex.alpha:
-            curr = curr.__next__
+            curr = curr.next
 
         if vertex.xy == curr.prev.xy:
 ##            if vertex.xy == curr.xy: self.replace(curr, vertex)
@@ -193,11 +200,43 @@ class Polygon(object):
         vertex.prev.next = vertex
         #print "inserted",vertex
 
+    def insert_sorted(self, vertices, start, end):
+        """Insert and sort all vertices found between a pair of vertices.
+
+        Same as insert(), but for all the intersection points of one
+        edge at once: they are sorted by alpha and spliced in with a
+        single pass. Points at the same xy as start, end or the last
+        inserted point are merged into that vertex instead.
+        """
+        self._prepared = None
+        prev = start
+        for vertex in sorted(vertices, key=lambda v: v.alpha):
+            if vertex.xy == start.xy:
+                self.replace(start, vertex)
+            elif vertex.xy == end.xy:
+                self.replace(end, vertex)
+            elif vertex.xy == prev.xy:
+                vertex.neighbour.neighbour = prev # same as a previously inserted intersection
+            else:
+                vertex.next = end
+                vertex.prev = prev
+                prev.next = vertex
+                end.prev = vertex
+                prev = vertex
+
+    @property
+    def prepared(self):
+        """Return the point location index of the polygon, built on first use
+        and dropped whenever vertices are added, inserted or replaced."""
+        if self._prepared is None:
+            self._prepared = PreparedPolygon(self)
+        return self._prepared
+
     def next_orig(self, v):
         """Return the next original vertex after the one specified."""
-        c = v.__next__
+        c = v.next
         while not c.orig:
-            c = c.__next__
+            c = c.next
         return c
 
     @property
@@ -259,11 +298,12 @@ class Polygon(object):
 
         f = True, b = False when stored in the entry record
         """
+        anyintersection = self.find_intersections(clip)
+        return self.clip_intersected(clip, s_entry, c_entry, anyintersection)
 
-        # detect clip mode
-        unionmode = not s_entry and not c_entry
-        intersectionmode = s_entry and c_entry
-        differencemode = not s_entry and c_entry
+    def find_intersections(self, clip):
+        """Phase one of clip(), inserts the intersections with the clip
+        polygon into both polygons. Returns True if there were any."""
 
         # prep by removing repeat of startpoint at end
         first = self.first
@@ -271,126 +311,28 @@ class Polygon(object):
         if last.x == first.x and last.y == first.y:
             first.prev = last.prev
             last.prev.next = first
+            self._prepared = None
         first = clip.first
         last = first.prev
         if last.x == first.x and last.y == first.y:
             first.prev = last.prev
             last.prev.next = first
+            clip._prepared = None
 
         # TODO: maybe also remove repeat points anywhere?
         # ...
         
         # phase one - find intersections
         # ------------------------------
-        anyintersection = False
-        
-        s = self.first
-        while s != self.first.prev:
-            c = clip.first
-            while c != clip.first.prev:
-                s_next_orig = self.next_orig(s)
-                c_next_orig = clip.next_orig(c)
-                res = intersect_or_on(s, s_next_orig,
-                                        c, c_next_orig)
-                if res:
-                    i, alphaS, alphaC = res
-                    
-##                    if alphaS == 0:
-##                        iS = s
-##                        iS.intersect = True
-##                        iS.entry = False
-##                    elif alphaS == 1:
-##                        iS = s_next_orig
-##                        iS.intersect = True
-##                        iS.entry = False
-##                    else:
-##                        # insert
-##                        iS = Vertex(i, alphaS, intersect=True, entry=False, orig=False)
-##                        v = s.next
-##                        while v != s_next_orig and v.alpha > alphaS:
-##                            v = v.next
-##                        print "insert S",s.xy,iS.xy,v.xy
-##                        s.next = iS
-##                        iS.prev = s
-##                        v.prev = iS
-##                        iS.next = v
-##
-##                    if alphaC == 0:
-##                        iC = c
-##                        iC.intersect = True
-##                        iC.entry = False
-##                    elif alphaC == 1:
-##                        iC = c_next_orig
-##                        iC.intersect = True
-##                        iC.entry = False
-##                    else:
-##                        # insert
-##                        iC = Vertex(i, alphaC, intersect=True, entry=False, orig=False)
-##                        v = c.next
-##                        while v != c_next_orig and v.alpha > alphaC:
-##                            v = v.next
-##                        print "insert C",c.xy,iC.xy,v.xy
-##                        c.next = iC
-##                        iC.prev = c
-##                        v.prev = iC
-##                        iC.next = v
-
-                    iS = Vertex(i, alphaS, intersect=True, entry=False, orig=False)
-                    iC = Vertex(i, alphaC, intersect=True, entry=False, orig=False)
-
-                    iS.neighbour = iC
-                    iC.neighbour = iS
-
-                    self.insert(iS, s, s_next_orig)
-                    print("insert S",s.xy,iS.xy,s_next_orig.xy)
-                    clip.insert(iC, c, c_next_orig)
-                    print("insert C",c.xy,iC.xy,c_next_orig.xy)
-                    
-                    anyintersection = True
-                
-                c = clip.next_orig(c)
-            s = self.next_orig(s)
-
-##        s_intsecs = []
-##        c_intsecs = []
-##        for s in self.iter(): # for each vertex Si of subject polygon do
-##            for c in clip.iter(): # for each vertex Cj of clip polygon do
-##                try:
-##                    #print "find isect %s - %s and %s - %s" %(s.xy, self.next(s.next).xy, c.xy, clip.next(c.next).xy )
-##                    s_next = self.next_nonintsec(s)
-##                    c_next = clip.next_nonintsec(c)
-##                    i, alphaS, alphaC = intersect_or_on(s, s_next,
-##                                                        c, c_next)
-##                    
-##                    iS = Vertex(i, alphaS, intersect=True, entry=False)
-##                    iC = Vertex(i, alphaC, intersect=True, entry=False)
-##
-##                    iS.neighbour = iC
-##                    iC.neighbour = iS
-##                    
-##                    s_intsecs.append( (iS, alphaS, s, s_next) )
-##                    c_intsecs.append( (iC, alphaC, c, c_next) )
-##     
-##                    anyintersection = True
-##                    
-##                except TypeError:
-##                    pass # this simply means intersect() returned None
-##
-##        # insert intersections into originals
-##        for iS,a,s,s_next in reversed(s_intsecs):
-##            if a == 0:
-##                self.replace(s, iS)
-##            elif a == 1:
-##                self.replace(s_next, iS)
-##            else:
-##                self.insert(iS, s, s_next)
-##        for iC,a,c,c_next in reversed(c_intsecs):
-##            if a == 0:
-##                self.replace(c, iC)
-##            elif a == 1:
-##                self.replace(c_next, iC)
-##            else:
-##                clip.insert(iC, c, c_next)
+        # only test edge pairs whose bounding boxes overlap, in the same
+        # order as testing each subject edge against every clip edge,
+        # on the coordinates of the vertices as Rings
+        s_vertices = list(self.iter())
+        c_vertices = list(clip.iter())
+        found = list(ring_intersections(Ring.from_vertices(s_vertices),
+                                        Ring.from_vertices(c_vertices)))
+        self.insert_intersections(clip, s_vertices, c_vertices, found)
+        anyintersection = bool(found)
 
         #print "testing if insert was done correctly"
         for s in self.iter():
@@ -400,6 +342,47 @@ class Polygon(object):
         for c in clip.iter():
             #print c
             pass
+
+        return anyintersection
+
+    def insert_intersections(self, clip, s_vertices, c_vertices, found):
+        """Insert the intersections ring_intersections() found into this
+        polygon and the clip polygon, s_vertices and c_vertices being 
+        their vertices in ring order. The intersections are collected per
+        edge to insert them at once."""
+        s_intsecs = dict()
+        c_intsecs = dict()
+        for si, ci, i, alphaS, alphaC in found:
+            iS = Vertex(i, alphaS, intersect=True, entry=False, orig=False)
+            iC = Vertex(i, alphaC, intersect=True, entry=False, orig=False)
+
+            iS.neighbour = iC
+            iC.neighbour = iS
+
+            s_intsecs.setdefault(si, []).append(iS)
+            c_intsecs.setdefault(ci, []).append(iC)
+
+        for si,intsecs in s_intsecs.items():
+            s = s_vertices[si]
+            self.insert_sorted(intsecs, s, self.next_orig(s))
+        for ci,intsecs in c_intsecs.items():
+            c = c_vertices[ci]
+            clip.insert_sorted(intsecs, c, clip.next_orig(c))
+
+    def clip_intersected(self, clip, s_entry, c_entry, anyintersection, locations=None):
+        """Phases two and three of clip(), once find_intersections() has run.
+
+        The prev/next locations of the intersections don't depend on the
+        operation, so they can be shared between operations on the same
+        pair through the locations dict.
+        """
+        if locations is None:
+            locations = dict()
+
+        # detect clip mode
+        unionmode = not s_entry and not c_entry
+        intersectionmode = s_entry and c_entry
+        differencemode = not s_entry and c_entry
                     
 
         # phase one and a half - no intersections between subject and clip, so correctly return results
@@ -409,43 +392,31 @@ class Polygon(object):
             if unionmode: # union
                 if clip.first.isInside(self):
                     # clip polygon is entirely inside subject, so just return subject shell
-                    clipped = Polygon()
-                    for s in self.iter():
-                        clipped.add(Vertex(s))
+                    clipped = Ring.from_vertices(self.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
                 elif self.first.isInside(clip):
                     # subject polygon is entirely inside clip, so just return clip shell
-                    clipped = Polygon()
-                    for c in clip.iter():
-                        clipped.add(Vertex(c))
+                    clipped = Ring.from_vertices(clip.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
                 else:
                     #clip polygon is entirely outside subject, so return both
-                    clipped = Polygon()
-                    for s in self.iter():
-                        clipped.add(Vertex(s))
+                    clipped = Ring.from_vertices(self.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
-                    clipped = Polygon()
-                    for c in clip.iter():
-                        clipped.add(Vertex(c))
+                    clipped = Ring.from_vertices(clip.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
             elif intersectionmode: # intersection
                 if clip.first.isInside(self):
                     # clip polygon is entirely inside subject, so the intersection is only the clip polygon
-                    clipped = Polygon()
-                    for c in clip.iter():
-                        clipped.add(Vertex(c))
+                    clipped = Ring.from_vertices(clip.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
                 elif self.first.isInside(clip):
                     # subject polygon is entirely inside clip, so the intersection is only the subject polygon
-                    clipped = Polygon()
-                    for s in self.iter():
-                        clipped.add(Vertex(s))
+                    clipped = Ring.from_vertices(self.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
                 else:
@@ -454,12 +425,8 @@ class Polygon(object):
             elif differencemode: # difference
                 if clip.first.isInside(self):
                     # clip polygon is entirely inside subject, so the difference is subject with clip as a hole
-                    clipped = Polygon()
-                    for s in self.iter():
-                        clipped.add(Vertex(s))
-                    hole = Polygon()
-                    for c in clip.iter():
-                        hole.add(Vertex(c))
+                    clipped = Ring.from_vertices(self.iter())
+                    hole = Ring.from_vertices(clip.iter())
                     polytuple = (clipped, [hole])
                     resultpolys.append(polytuple)
                 elif self.first.isInside(clip):
@@ -467,9 +434,7 @@ class Polygon(object):
                     pass
                 else:
                     #clip polygon is entirely outside subject, so difference is simply the subject
-                    clipped = Polygon()
-                    for s in self.iter():
-                        clipped.add(Vertex(s))
+                    clipped = Ring.from_vertices(self.iter())
                     polytuple = (clipped, [])
                     resultpolys.append(polytuple)
             # no need to continue so just return result
@@ -495,13 +460,17 @@ class Polygon(object):
             #print "\t",c
             # intersection is degenerate, is the start/endpoint of a line
             # so maybe delete intersection flag based on prev/next locations
-            prevloc = testLocation(c.prev, poly)
-            nextloc = testLocation(c.__next__, poly)
-            if prevloc == "on" or nextloc == "on":
-                prevmid = Vertex(((c.x+c.prev.x)/2.0,(c.y+c.prev.y)/2.0))
-                prevloc = testLocation(prevmid, poly)
-                nextmid = Vertex(((c.x+c.next.x)/2.0,(c.y+c.next.y)/2.0))
-                nextloc = testLocation(nextmid, poly)
+            if c in locations:
+                prevloc, nextloc = locations[c]
+            else:
+                prevloc = testLocation(c.prev, poly)
+                nextloc = testLocation(c.next, poly)
+                if prevloc == "on" or nextloc == "on":
+                    prevmid = Vertex(((c.x+c.prev.x)/2.0,(c.y+c.prev.y)/2.0))
+                    prevloc = testLocation(prevmid, poly)
+                    nextmid = Vertex(((c.x+c.next.x)/2.0,(c.y+c.next.y)/2.0))
+                    nextloc = testLocation(nextmid, poly)
+                locations[c] = prevloc, nextloc
             if prevloc == "in" or nextloc == "in":
                 poly.anyinside = True
             #print "\t %s -> degenintsec -> %s" %(prevloc,nextloc)
@@ -551,13 +520,13 @@ class Polygon(object):
                     print("Maybe crosschange...")
                     # tri1
                     #a,b,c = c.neighbour.prev, c.prev, c.neighbour.next
-                    a,b,c = c.neighbour.__next__, c.prev, c.neighbour.prev
+                    a,b,c = c.neighbour.next, c.prev, c.neighbour.prev
                     dir1 = 0.5 * (a.x * (b.y-c.y) +
                                   b.x * (c.y-a.y) +
                                   c.x * (a.y-b.y))
                     # tri2
                     #a,b,c = c.neighbour.prev, c.prev, c.next
-                    a,b,c = c.__next__, c.prev, c.neighbour.prev
+                    a,b,c = c.next, c.prev, c.neighbour.prev
                     dir2 = 0.5 * (a.x * (b.y-c.y) +
                                   b.x * (c.y-a.y) +
                                   c.x * (a.y-b.y))
@@ -638,9 +607,17 @@ class Polygon(object):
 
         ######
         # Defs
-        def next_unprocessed(vert):
-            origvert = vert
-            while vert:
+        def next_unprocessed():
+            # the first vertex of the worklist that can start a polygon.
+            # Checked vertices and those without an entry flag never can
+            # again (checked flags are only set, and a deleted entry flag is
+            # never restored) so they're dropped from the front. A couple 
+            # vertex failing rule 2 stays, DeleteFlag2 may yet turn its or
+            # its couple's "en/ex" or "ex/en" flag into a matching one.
+            while worklist and not (worklist[0].entry and not 
+                (worklist[0].checked or worklist[0].neighbour.checked)):
+                worklist.popleft()
+            for vert in worklist:
                 if vert.entry and not (vert.checked or vert.neighbour.checked):
                     #print "vert, found next unproc", vert, vert.checked, vert.neighbour.checked
                     if vert.couple:
@@ -654,12 +631,7 @@ class Polygon(object):
                     # rule 3
                     else:
                         return vert
-                
-                vert = vert.__next__
-                
-                if vert == origvert:
-                    # if returned to first, return None
-                    return None
+            return None
 
         def DeleteFlag1(cur, stat):
             if cur.entry == "en/ex":
@@ -737,10 +709,12 @@ class Polygon(object):
         def proceed(cur, stat):
             cur.checked = True
             if stat == "D1":
-                clipped.add(Vertex(cur))
-                return cur.__next__
+                xs.append(cur.x)
+                ys.append(cur.y)
+                return cur.next
             elif stat == "D2":
-                clipped.add(Vertex(cur))
+                xs.append(cur.x)
+                ys.append(cur.y)
                 return cur.prev
             else:
                 return cur.neighbour
@@ -749,7 +723,8 @@ class Polygon(object):
         resultpolys = []
 
         self.first.checked = True
-        cur = prev = start = next_unprocessed(self.first)
+        worklist = deque(v for v in self.iter() if v.entry)
+        cur = prev = start = next_unprocessed()
 
         while cur:
             # each new polygon
@@ -757,7 +732,7 @@ class Polygon(object):
 
             stat = DeleteFlag1(cur, "D3")
             if DEBUG: print("v", cur, cur.entry, stat)
-            clipped = Polygon()
+            xs, ys = [], []
             cur = proceed(cur, stat)
 
             # collect vertexes
@@ -772,24 +747,19 @@ class Polygon(object):
                 cur = proceed(cur, stat)
 
             # return to first vertex
-            clipped.add(Vertex(clipped.first))
+            xs.append(xs[0])
+            ys.append(ys[0])
+            clipped = Ring(xs, ys)
 
             print(clipped)
 
             resultpolys.append((clipped,[]))
-            cur = prev = start = next_unprocessed(self.first)
+            cur = prev = start = next_unprocessed()
 
 
 
         # finally, sort into exteriors and holes
-        for pindex,(polyext,polyholes) in enumerate(resultpolys):
-            for otherext,otherholes in resultpolys:
-                if polyext == otherext:
-                    continue # don't compare to self
-                if polyext.first.isInside(otherext):
-                    otherholes.append(polyext) #poly is within other so make into a hole
-                    del resultpolys[pindex] #and delete poly from being an independent poly
-        return resultpolys
+        return nest_rings([polyext for polyext,polyholes in resultpolys])
 
 
 
@@ -809,33 +779,305 @@ class Polygon(object):
         s = self.first
         while True:
             yield s
-            s = s.__next__
+            s = s.next
             if s == self.first:
                 return
 
+    @classmethod
+    def from_ring(cls, ring):
+        """Return a linked Polygon of the vertices of a Ring, and the
+        vertices as a list in ring order."""
+        poly = cls()
+        vertices = [Vertex(xy) for xy in zip(ring.x, ring.y)]
+        for v in vertices:
+            poly.add(v)
+        return poly, vertices
+
+
+class Ring(object):
+    """Polygon ring stored as parallel arrays of x and y coordinates.
+
+    The clipping functions read their input into Rings and find the
+    intersections in them (phase one), and the traversal (phase three)
+    writes the clipped polygons as Rings, so only phases two and three
+    need the linked Vertex objects of a Polygon. The columns are
+    array('d') unless that would turn integer coordinates into floats,
+    then they are kept as lists. Rings have the parts of the Polygon
+    interface that nest_rings() and testLocation() use.
+    """
+    __slots__ = ("x", "y", "_prepared")
+
+    def __init__(self, xs=(), ys=()):
+        self.x = _column(xs)
+        self.y = _column(ys)
+        self._prepared = None
+
+    @classmethod
+    def from_points(cls, points):
+        return cls([x for x,y in points], [y for x,y in points])
+
+    @classmethod
+    def from_buffer(cls, coords):
+        """Ring of a flat x0,y0,x1,y1,... buffer, an odd last value is ignored."""
+        end = len(coords) // 2 * 2
+        return cls(coords[0:end:2], coords[1:end:2])
+
+    @classmethod
+    def from_vertices(cls, vertices):
+        vertices = list(vertices)
+        return cls([v.x for v in vertices], [v.y for v in vertices])
+
+    def __len__(self):
+        return len(self.x)
+
+    def drop_closing(self):
+        """Remove the repeat of the first point at the end, if any."""
+        if len(self.x) > 1 and self.x[-1] == self.x[0] and self.y[-1] == self.y[0]:
+            del self.x[-1]
+            del self.y[-1]
+            self._prepared = None
+
+    def edge_boxes(self, count):
+        """Bounding boxes of the first count edges, edge i going from
+        vertex i to i+1."""
+        x, y = self.x, self.y
+        return [(min(x1,x2), min(y1,y2), max(x1,x2), max(y1,y2))
+                for x1,y1,x2,y2 in zip(x, y, x[1:count+1], y[1:count+1])]
+
+    def buffer(self):
+        """The coordinates as a flat x0,y0,x1,y1,... array('d')."""
+        coords = array('d', [0.0]) * (2 * len(self.x))
+        coords[0::2] = array('d', self.x)
+        coords[1::2] = array('d', self.y)
+        return coords
+
+    @property
+    def first(self):
+        return Vertex((self.x[0], self.y[0]))
+
+    @property
+    def points(self):
+        return list(zip(self.x, self.y))
+
+    @property
+    def prepared(self):
+        if self._prepared is None:
+            self._prepared = PreparedPolygon(self)
+        return self._prepared
+
+    def iter(self):
+        """Iterate over the points as unlinked Vertex objects."""
+        for xy in zip(self.x, self.y):
+            yield Vertex(xy)
+
+    def __repr__(self):
+        return "\n" + "".join("%02d: (%.2f, %.2f)\n" % (i + 1, x, y)
+                              for i,(x,y) in enumerate(zip(self.x, self.y)))
 
+def _column(values):
+    # array('d') for float coordinates, a list if any of them isn't one
+    if isinstance(values, array) and values.typecode == 'd':
+        return array('d', values)
+    values = list(values)
+    if all(type(v) is float for v in values):
+        return array('d', values)
+    return values
 
 
+
+
+def candidate_pairs(s_boxes, c_boxes):
+    """Yield the (subject, clip) index pairs of the edges whose bounding
+    boxes overlap, sorted as in a nested loop over all pairs.
+    Each box is a (xmin, ymin, xmax, ymax) tuple. The clip edges are put 
+    in a uniform grid of about one edge per cell, so each subject edge is
+    only compared to the clip edges in the cells it covers.
+    """
+    if not s_boxes or not c_boxes:
+        return
+    xmin = min(b[0] for b in c_boxes)
+    ymin = min(b[1] for b in c_boxes)
+    xmax = max(b[2] for b in c_boxes)
+    ymax = max(b[3] for b in c_boxes)
+    size = max(1, int(len(c_boxes) ** 0.5))
+    cellw = (xmax - xmin) / float(size) or 1.0
+    cellh = (ymax - ymin) / float(size) or 1.0
+    def cells(b):
+        x1 = min(size-1, max(0, int((b[0] - xmin) / cellw)))
+        x2 = min(size-1, max(0, int((b[2] - xmin) / cellw)))
+        y1 = min(size-1, max(0, int((b[1] - ymin) / cellh)))
+        y2 = min(size-1, max(0, int((b[3] - ymin) / cellh)))
+        for cx in range(x1, x2+1):
+            for cy in range(y1, y2+1):
+                yield cx,cy
+    grid = dict()
+    for ci,b in enumerate(c_boxes):
+        for cell in cells(b):
+            grid.setdefault(cell, []).append(ci)
+
+    for si,sb in enumerate(s_boxes):
+        if sb[2] < xmin or sb[0] > xmax or sb[3] < ymin or sb[1] > ymax:
+            continue
+        found = set()
+        for cell in cells(sb):
+            found.update(grid.get(cell, ()))
+        for ci in sorted(found):
+            cb = c_boxes[ci]
+            if sb[0] <= cb[2] and cb[0] <= sb[2] and sb[1] <= cb[3] and cb[1] <= sb[3]:
+                yield si,ci
+
+def nest_rings(polys):
+    """Sort polygons into (exterior, list of holes) tuples.
+
+    Each polygon's parent is the smallest larger polygon containing it,
+    polygons at odd depths are holes of their parent. Exteriors keep
+    their order in polys. Candidate parents
+    come from a uniform grid over the bounding boxes, and only those
+    whose box contains the polygon's box get a point location test.
+    """
+    rings = []
+    for index,poly in enumerate(polys):
+        pts = poly.points
+        area = abs(sum(x1*y2 - x2*y1 for (x1,y1),(x2,y2) in zip(pts, pts[1:] + pts[:1]))) / 2.0
+        xs = [x for x,y in pts]
+        ys = [y for x,y in pts]
+        rings.append((area, (min(xs), min(ys), max(xs), max(ys)), poly, index))
+    if not rings:
+        return []
+    rings.sort(key=lambda ring: -ring[0])
+
+    xmin = min(box[0] for area,box,poly,index in rings)
+    ymin = min(box[1] for area,box,poly,index in rings)
+    xmax = max(box[2] for area,box,poly,index in rings)
+    ymax = max(box[3] for area,box,poly,index in rings)
+    size = max(1, int(len(rings) ** 0.5))
+    cellw = (xmax - xmin) / float(size) or 1.0
+    cellh = (ymax - ymin) / float(size) or 1.0
+    def cell(x, y):
+        return (min(size-1, int((x - xmin) / cellw)),
+                min(size-1, int((y - ymin) / cellh)))
+    grid = dict()
+
+    depth = []
+    owner = [] # index into result of each exterior
+    result = []
+    for i,(area,box,poly,index) in enumerate(rings):
+        parent = None
+        # a containing polygon covers the cell of the box corner, and
+        # was added after any larger ones
+        for j in reversed(grid.get(cell(box[0], box[1]), [])):
+            other = rings[j][1]
+            if other[0] > box[0] or other[1] > box[1] or other[2] < box[2] or other[3] < box[3]:
+                continue
+            for v in poly.iter():
+                loc = testLocation(v, rings[j][2])
+                if loc != "on":
+                    break
+            if loc == "in":
+                parent = j
+                break
+        if parent is not None and depth[parent] % 2 == 0:
+            depth.append(depth[parent] + 1)
+            owner.append(None)
+            result[owner[parent]][1][1].append(poly)
+        else:
+            depth.append(depth[parent] + 1 if parent is not None else 0)
+            owner.append(len(result))
+            result.append((index, (poly, [])))
+        x1,y1 = cell(box[0], box[1])
+        x2,y2 = cell(box[2], box[3])
+        for cx in range(x1, x2+1):
+            for cy in range(y1, y2+1):
+                grid.setdefault((cx,cy), []).append(i)
+    result.sort(key=lambda item: item[0])
+    return [polytuple for index,polytuple in result]
+
 def intersect_or_on(s1, s2, c1, c2):
     """Same as intersect(), except returns
     intersection even if degenerate.
     """
-    den = float( (c2.y - c1.y) * (s2.x - s1.x) - (c2.x - c1.x) * (s2.y - s1.y) )
+    return intersect_or_on_xy(s1.x, s1.y, s2.x, s2.y, c1.x, c1.y, c2.x, c2.y)
+
+def intersect_or_on_xy(s1x, s1y, s2x, s2y, c1x, c1y, c2x, c2y):
+    """Same as intersect_or_on(), for the edge coordinates."""
+    den = float( (c2y - c1y) * (s2x - s1x) - (c2x - c1x) * (s2y - s1y) )
     if not den:
         return None
 
-    us = ((c2.x - c1.x) * (s1.y - c1.y) - (c2.y - c1.y) * (s1.x - c1.x)) / den
-    uc = ((s2.x - s1.x) * (s1.y - c1.y) - (s2.y - s1.y) * (s1.x - c1.x)) / den
+    us = ((c2x - c1x) * (s1y - c1y) - (c2y - c1y) * (s1x - c1x)) / den
+    uc = ((s2x - s1x) * (s1y - c1y) - (s2y - s1y) * (s1x - c1x)) / den
 
     if (0 <= us <= 1) and (0 <= uc <= 1):
         #subj and clip line intersect eachother somewhere in the middle
         #this includes the possibility of degenerates (edge intersections)
-        x = s1.x + us * (s2.x - s1.x)
-        y = s1.y + us * (s2.y - s1.y)
+        x = s1x + us * (s2x - s1x)
+        y = s1y + us * (s2y - s1y)
         return (x, y), us, uc
     else:
         return None
 
+def ring_intersections(subject, clip):
+    """Phase one on two Rings: yield (subject edge, clip edge, point,
+    alphaS, alphaC) for each intersection, in the order of a nested 
+    loop over the edge pairs. Like Polygon.find_intersections() the
+    closing edge from the last vertex back to the first isn't tested.
+    """
+    s_count = len(subject) - 1
+    c_count = len(clip) - 1
+    sx, sy, cx, cy = subject.x, subject.y, clip.x, clip.y
+    for si, ci in candidate_pairs(subject.edge_boxes(s_count), clip.edge_boxes(c_count)):
+        res = intersect_or_on_xy(sx[si], sy[si], sx[si+1], sy[si+1],
+                                 cx[ci], cy[ci], cx[ci+1], cy[ci+1])
+        if res:
+            i, alphaS, alphaC = res
+            yield si, ci, i, alphaS, alphaC
+
+def find_ring_intersections(subject, clip):
+    """Phase one for two Rings. Returns their Polygons with the 
+    intersections inserted, and whether there were any."""
+    subject.drop_closing()
+    clip.drop_closing()
+    found = list(ring_intersections(subject, clip))
+    Subject, s_vertices = Polygon.from_ring(subject)
+    Clipper, c_vertices = Polygon.from_ring(clip)
+    Subject.insert_intersections(Clipper, s_vertices, c_vertices, found)
+    return Subject, Clipper, bool(found)
+
+class PreparedPolygon(object):
+    """Point location index over the edges of a Polygon.
+
+    The edges are put in horizontal slabs covering their y range, so
+    testLocation() only has to look at the edges in the slab of the
+    point instead of going around the whole polygon.
+    """
+
+    def __init__(self, polygon):
+        pts = polygon.points
+        edges = [(x1, y1, x2, y2) for (x1,y1),(x2,y2) in zip(pts, pts[1:] + pts[:1])]
+        self.ymin = min(y for x,y in pts)
+        self.ymax = max(y for x,y in pts)
+        # about one slab per edge, but fewer when the edges are tall
+        # so the index stays within a few entries per edge
+        spans = sum(abs(e[3] - e[1]) for e in edges) / ((self.ymax - self.ymin) or 1.0)
+        self.count = max(1, min(len(edges), int(4 * len(edges) / (spans or 1.0))))
+        self.height = (self.ymax - self.ymin) / float(self.count) or 1.0
+        self.slabs = [[] for _ in range(self.count)]
+        for edge in edges:
+            lo = self.slab(min(edge[1], edge[3]))
+            hi = self.slab(max(edge[1], edge[3]))
+            for i in range(lo, hi+1):
+                self.slabs[i].append(edge)
+
+    def slab(self, y):
+        return min(self.count-1, max(0, int((y - self.ymin) / self.height)))
+
+    def edges_at(self, y):
+        """Return the edges as (x1,y1,x2,y2) tuples, including all those
+        whose y range contains y."""
+        if y < self.ymin or y > self.ymax:
+            return []
+        return self.slabs[self.slab(y)]
+
 def testLocation(point, polygon):
     """
     Effective scanline test for the location of a point vis a vis a polygon.
@@ -845,46 +1087,49 @@ def testLocation(point, polygon):
         "The point in polygon problem for arbitrary polygons".
         Computational Geometry: Theory and Applications, 
         Volume 20 Issue 3, November 2001
+    Only the edges crossing the y of the point can change the result,
+    so these are looked up in the polygon's prepared index.
     """
     # begin
     if polygon.first.y == point.y and polygon.first.x == point.x:
         return "on" # vertex
+    px,py = point.x,point.y
     w =0
-    for v in polygon.iter():
-        if v.next.y == point.y:
-            if v.next.x == point.x:
+    for vx,vy,nx,ny in polygon.prepared.edges_at(py):
+        if ny == py:
+            if nx == px:
                 return "on" # vertex
             else:
-                if v.y == point.y and (v.next.x > point.x) == (v.x < point.x):
+                if vy == py and (nx > px) == (vx < px):
                     return "on" # edge
         # if crossing horizontal line
-        if (v.y < point.y and v.next.y >= point.y)\
-               or (v.y >= point.y and v.next.y < point.y):
-            if v.x >= point.x:
-                if v.next.x > point.x:
+        if (vy < py and ny >= py)\
+               or (vy >= py and ny < py):
+            if vx >= px:
+                if nx > px:
                     # modify w
-                    if v.next.y > v.y: w += 1
+                    if ny > vy: w += 1
                     else: w -= 1
                 else:
-                    det = (v.x - point.x) * (v.next.y - point.y) \
-                        - (v.next.x - point.x) * (v.y - point.y)
+                    det = (vx - px) * (ny - py) \
+                        - (nx - px) * (vy - py)
                     if det == 0: return "on" # edge
                     # if right crossing
-                    if (det > 0 and v.next.y > v.y)\
-                       or (det < 0 and v.next.y < v.y):
+                    if (det > 0 and ny > vy)\
+                       or (det < 0 and ny < vy):
                         # modify w
-                        if v.next.y > v.y: w += 1
+                        if ny > vy: w += 1
                         else: w -= 1
             else:
-                if v.next.x > point.x:
-                    det = (v.x - point.x) * (v.next.y - point.y) \
-                        - (v.next.x - point.x) * (v.y - point.y)
+                if nx > px:
+                    det = (vx - px) * (ny - py) \
+                        - (nx - px) * (vy - py)
                     if det == 0: return "on" # edge
                     # if right crossing
-                    if (det > 0 and v.next.y > v.y)\
-                       or (det < 0 and v.next.y < v.y):
+                    if (det > 0 and ny > vy)\
+                       or (det < 0 and ny < vy):
                         # modify w
-                        if v.next.y > v.y: w += 1
+                        if ny > vy: w += 1
                         else: w -= 1
     if (w % 2) != 0:
         return "in"
@@ -897,14 +1142,11 @@ def clip_polygon(subject, clipper, operation = 'difference'):
     Since input polygons are lists of points, output is also in list format.
     Each polygon in the resultlist is a tuple of: (polygon exterior, list of polygon holes)
     """
-    Subject = Polygon()
-    Clipper = Polygon()
-
-    for s in subject:
-        Subject.add(Vertex(s))
+    return _clip_rings(Ring.from_points(subject), Ring.from_points(clipper),
+                       operation, lambda ring: ring.points)
 
-    for c in clipper:
-        Clipper.add(Vertex(c))
+def _clip_rings(subject, clipper, operation, output):
+    # clip_polygon() on two Rings, output converts the resulting rings
 
 ##    for s in Subject.iter():
 ##        if ("%.2f"%s.x == "12.14" and "%.2f"%s.y == "63.05") \
@@ -914,12 +1156,77 @@ def clip_polygon(subject, clipper, operation = 'difference'):
 ##            print s.neighbour
 ##            print "---"
 
-    clipped = Clipper.difference(Subject)\
-    if operation == 'reversed-diff'\
-    else Subject.__getattribute__(operation)(Clipper)
+    if operation == 'reversed-diff':
+        Clipper, Subject, anyintersection = find_ring_intersections(clipper, subject)
+        clipped = Clipper.clip_intersected(Subject, False, True, anyintersection)
+    else:
+        s_entry, c_entry = _ENTRY_FLAGS[operation]
+        Subject, Clipper, anyintersection = find_ring_intersections(subject, clipper)
+        clipped = Subject.clip_intersected(Clipper, s_entry, c_entry, anyintersection)
+
+    return [(output(ext),[output(hole) for hole in holes]) for ext,holes in clipped]
 
-    clipped = [(ext.points,[hole.points for hole in holes]) for ext,holes in clipped]
-    return clipped
+# the entry flags of Polygon.clip() for each operation
+_ENTRY_FLAGS = {'union': (False, False),
+                'intersect': (True, True),
+                'difference': (False, True)}
+
+def clip_polygon_multi(subject, clipper, operations = ('intersect', 'union', 'difference')):
+    """
+    Same as calling clip_polygon() for each of several operations on the
+    same pair. For 'intersect', 'union' and 'difference' the intersections
+    are found and their locations tested only once, each operation then
+    runs on a fresh copy of the traversal flags. 'reversed-diff' finds its
+    intersections from the clip polygon's side like clip_polygon() does,
+    so it is clipped separately. Returns a dict of results keyed by
+    operation; an operation that fails maps to the exception it raised
+    instead, so the others still get their results.
+    """
+    results = dict()
+    shared = [op for op in operations if op != 'reversed-diff']
+    if len(shared) < len(operations):
+        try:
+            results['reversed-diff'] = clip_polygon(subject, clipper, 'reversed-diff')
+        except Exception as err:
+            results['reversed-diff'] = err
+    if not shared:
+        return results
+
+    try:
+        Subject, Clipper, anyintersection = find_ring_intersections(
+            Ring.from_points(subject), Ring.from_points(clipper))
+    except Exception as err:
+        for operation in shared:
+            results[operation] = err
+        return results
+    locations = dict()
+    flags = [(v, v.entry, v.checked, v.couple, v.cross_change)
+             for poly in (Subject, Clipper) for v in poly.iter()]
+
+    for operation in shared:
+        for v, entry, checked, couple, cross_change in flags:
+            v.entry, v.checked, v.couple, v.cross_change = entry, checked, couple, cross_change
+
+        s_entry, c_entry = _ENTRY_FLAGS[operation]
+        try:
+            clipped = Subject.clip_intersected(Clipper, s_entry, c_entry, anyintersection, locations)
+        except Exception as err:
+            results[operation] = err
+            continue
+
+        results[operation] = [(ext.points,[hole.points for hole in holes]) for ext,holes in clipped]
+    return results
+
+def clip_polygon_buffers(subject, clipper, operation = 'difference'):
+    """
+    Same as clip_polygon(), but for polygons given as flat coordinate
+    buffers (x0,y0,x1,y1,...), such as array('d') or a list of floats.
+    The buffers are read into Rings without building point tuples, and
+    each output ring is an array('d') in the same flat layout: a list 
+    of (exterior buffer, list of hole buffers).
+    """
+    return _clip_rings(Ring.from_buffer(subject), Ring.from_buffer(clipper),
+                       operation, Ring.buffer)
 
 
 
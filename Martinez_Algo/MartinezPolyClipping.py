@@ -7,6 +7,10 @@
 # STATUS: Mostly implemented but doesnt yet work even for simple cases
 # not yet implemented support for overlapping edges or selfintersections
 
+import heapq
+import random
+from collections import deque
+
 # Classes and helpers
 
 def pairwise(points):
@@ -16,67 +20,156 @@ def pairwise(points):
     for curpoint,nextpoint in zip(a, b):
         yield curpoint, nextpoint
 
+def ring_edges(points):
+    """Like pairwise() but also yields the closing edge of the ring,
+    and skips zero-length edges."""
+    if points[0] == points[-1]:
+        points = points[:-1]
+    for curpoint,nextpoint in zip(points, points[1:] + points[:1]):
+        if curpoint != nextpoint:
+            yield curpoint, nextpoint
+
+def signed_area(p0, p1, p2):
+    return (p0[0] - p2[0]) * (p1[1] - p2[1]) - (p1[0] - p2[0]) * (p0[1] - p2[1])
+
+
+def segment_below(le1, le2):
+    """Sweep line order of the edges of left endpoints le1 and le2,
+    True if le1's edge lies below le2's at the current sweep position.
+    """
+    if le1 is le2:
+        return False
+    if signed_area(le1.xy, le1.other.xy, le2.xy) != 0 or \
+       signed_area(le1.xy, le1.other.xy, le2.other.xy) != 0:
+        # not collinear
+        if le1.xy == le2.xy:
+            # same left endpoint, use the right endpoint to sort
+            return le1.below(le2.other.xy)
+        if le1.x == le2.x:
+            return le1.y < le2.y
+        if le2 < le1:
+            # le1 was inserted after le2
+            return not le2.below(le1.xy)
+        return le1.below(le2.xy)
+    # collinear, any consistent order will do
+    if le1.polytype != le2.polytype:
+        return le1.polytype < le2.polytype
+    if le1.xy == le2.xy:
+        return id(le1) < id(le2)
+    return le2 < le1
+
+
+class SweepNode:
+    __slots__ = ("edge", "next", "prev")
+
+    def __init__(self, edge, level):
+        self.edge = edge
+        self.next = [None] * level
+        self.prev = [None] * level
+
 
 class Sweepline:
+    """The edges currently crossing the sweep line, ordered bottom
+    to top by segment_below(). Kept in a skip list so insert, erase
+    and neighbour lookups are O(log n); the node of each edge is
+    stored on its left endpoint as a handle.
+    """
+    MAXLEVEL = 32
+
     def __init__(self):
-        self.edges = []
+        self.head = SweepNode(None, self.MAXLEVEL)
+        self.level = 1
+        self.random = random.Random(0)
 
     def insert(self, edge):
-        if len(self.edges) > 0:
-            pos = 0
-            for v in self.edges:
-                if v.y > edge.y or (not edge.vertical and v.y == edge.y): # nonvertical are placed first for same points, otherwise after
-                    break
-                pos += 1
-            self.edges.insert(pos,edge)
-        else:
-            self.edges.append(edge)
+        level = 1
+        while level < self.MAXLEVEL and self.random.random() < 0.5:
+            level += 1
+        self.level = max(self.level, level)
+        node = SweepNode(edge, level)
+        cur = self.head
+        for i in reversed(range(self.level)):
+            while cur.next[i] is not None and segment_below(cur.next[i].edge, edge):
+                cur = cur.next[i]
+            if i < level:
+                node.prev[i] = cur
+                node.next[i] = cur.next[i]
+                if cur.next[i] is not None:
+                    cur.next[i].prev[i] = node
+                cur.next[i] = node
+        edge.node = node
 
     def next(self, edge):
-        for cur in self.edges:
-            if cur.y > edge.y:
-                break
-        else:
-            return None
-        return cur
+        node = edge.node.next[0]
+        return node.edge if node is not None else None
 
     def prev(self, edge):
-        for cur in reversed(self.edges):
-            if cur.y < edge.y:
-                break
-        else:
-            return None
-        return cur
+        return edge.node.prev[0].edge # head node has no edge
 
     def erase(self, edge):
-        self.edges.remove(edge)
+        node = edge.node
+        for i in range(len(node.next)):
+            node.prev[i].next[i] = node.next[i]
+            if node.next[i] is not None:
+                node.next[i].prev[i] = node.prev[i]
+        edge.node = None
+
+    def __contains__(self, edge):
+        return edge.node is not None
     
 
 class Endpoint: # aka sweepevent
+    __slots__ = ("xy", "x", "y", "other", "node", "polytype",
+                 "inout", "inside", "edgetype", "left", "vertical", "key")
+
     def __init__(self, xy, polytype):
         self.xy = xy
         self.x,self.y = xy
-        self.other = None # must be set manually as a reference
+        self.other = None # set with link_endpoints()
+        self.node = None # handle in the Sweepline while it contains the edge
         self.polytype = polytype
         self.inout = ""
         self.inside = ""
         self.edgetype = ""
+        self.left = self.vertical = None
+        self.key = None
 
-    @property
-    def vertical(self):
-        return self.xy[0] == self.other.xy[0]
-
-    @property
-    def left(self):
-        if self.vertical:
-            return self.xy[1] < self.other.xy[1] # vertical edge, lower y is considered left
+    def below(self, xy):
+        """True if the point xy lies above the line of this edge"""
+        if self.left:
+            return signed_area(self.xy, self.other.xy, xy) > 0
         else:
-            return self.xy[0] < self.other.xy[0]
+            return signed_area(self.other.xy, self.xy, xy) > 0
+
+    def __lt__(self, other):
+        # event queue order: x asc, y asc, right endpoints before left ones,
+        # and for the same point and side the lower edge first
+        if self.key != other.key:
+            return self.key < other.key
+        return self.below(other.other.xy)
 
     def __str__(self):
         return ("Left" if self.left else "Right") + "Endpoint(%s, %s)" % self.xy + " --> (%s, %s)" % self.other.xy
 
 
+def link_endpoints(ep1, ep2):
+    """Makes ep1 and ep2 the two ends of an edge and precomputes the
+    flags and queue key that only depend on the edge, so they're not
+    recomputed on every comparison. Must be called again whenever an
+    edge gets a new other end.
+    """
+    ep1.other = ep2
+    ep2.other = ep1
+    ep1.vertical = ep2.vertical = ep1.x == ep2.x
+    if ep1.vertical:
+        ep1.left = ep1.y < ep2.y # vertical edge, lower y is considered left
+    else:
+        ep1.left = ep1.x < ep2.x
+    ep2.left = not ep1.left
+    # x asc, y asc, right endpoints (False) before left ones
+    ep1.key = (ep1.x, ep1.y, ep1.left)
+    ep2.key = (ep2.x, ep2.y, ep2.left)
+
 
 def set_inside_flag(endpoint, prevendpoint):
     endpoint1, endpoint2 = endpoint, prevendpoint
@@ -84,7 +177,7 @@ def set_inside_flag(endpoint, prevendpoint):
         endpoint1.inside = endpoint1.inout = False
     elif endpoint1.polytype == endpoint2.polytype:
         endpoint1.inside = endpoint2.inside
-        endpoint1.inout = endpoint2.inout
+        endpoint1.inout = not endpoint2.inout
     else:
         endpoint1.inside = not endpoint2.inout
         endpoint1.inout = endpoint2.inside
@@ -108,63 +201,40 @@ def possible_subdivide(ep1, ep2, S, Q):
     if intersect:
         ipoint,alphaS,alphaC = intersect
         if 0.0 < alphaS < 1.0 or 0.0 < alphaC < 1.0:
-            # subdivide so the lines do not intersect...?
-            # ie replace the isect point to the end of each edge
-            right = ep1.other
-            ep1.other = Endpoint(ipoint, ep1.polytype)
-            ep1.other.other = ep1
-            assert ep1.left
-            ep1ext = Endpoint(ipoint, ep1.polytype)
-            ep1ext.other = right
-            right.other = ep1ext
-            assert ep1ext.left
-            right = ep2.other
-            ep2.other = Endpoint(ipoint, ep2.polytype)
-            ep2.other.other = ep2
-            assert ep2.left
-            ep2ext = Endpoint(ipoint, ep2.polytype)
-            ep2ext.other = right
-            right.other = ep2ext
-            assert ep2ext.left
-            
-            # update Q and S
-            # TODO: The Q endpoints mut be inserted sorted bottom to top plus more
-            
-##            cur = Q[1] if len(Q) > 1 else Q[0]
-##            curpos = 0
-##            while cur.x == p2.x and cur.y < p2.y and not cur.left:
-##                curpos += 1
-##            Q.insert(pos-1,p2)
-##
-##            cur = Q[1] if len(Q) > 1 else Q[0]
-##            curpos = 0
-##            while cur.x == p4.x and cur.y < p4.y and not cur.left:
-##                curpos += 1
-##            Q.insert(pos-1,p4)
-            
-            for pos,v in enumerate(Q):
-                if v.y > ep1ext.y or v.x != ep1ext.x or (v.xy == ep1ext.xy and not ep1ext.left and v.left):
-                    assert pos >= 0
-                    while v.xy == ep1ext.xy and ep1ext.left and v.left and S.edges.index(v) < S.edges.index(ep1ext):
-                        pos += 1
-                    Q.insert(pos,ep1ext)
-                    break
-            for pos,v in enumerate(Q):
-                if v.y > ep2ext.y or v.x != ep2ext.x or (v.xy == ep2ext.xy and not ep2ext.left and v.left):
-                    assert pos >= 0
-                    while v.xy == ep2ext.xy and ep1ext.left and v.left and S.edges.index(v) < S.edges.index(ep2ext):
-                        pos += 1
-                    Q.insert(pos,ep2ext)
-                    break
-    
-            S.insert(ep1ext)
-            S.insert(ep2ext)
+            # snap to an endpoint when (nearly) at one, otherwise rounding
+            # makes the split parts intersect again a hair away from it
+            eps = 1e-9
+            if alphaC < eps: ipoint = ep2.xy
+            elif alphaC > 1 - eps: ipoint = ep2.other.xy
+            elif alphaS < eps: ipoint = ep1.xy
+            elif alphaS > 1 - eps: ipoint = ep1.other.xy
+            # subdivide so the lines do not intersect
+            # ie split each edge at the isect point, unless it only
+            # touches it with one of its ends
+            if ipoint != ep1.xy and ipoint != ep1.other.xy:
+                divide_segment(ep1, ipoint, Q)
+            if ipoint != ep2.xy and ipoint != ep2.other.xy:
+                divide_segment(ep2, ipoint, Q)
 
         else:
             # only intersect at one of their endpoints, stop processing
             return
 
 
+def divide_segment(ep, ipoint, Q):
+    """Splits the edge of left endpoint ep at ipoint, and queues
+    the two new endpoints: the right end of the left part and the
+    left end of the right part.
+    """
+    assert ep.left
+    right = ep.other
+    link_endpoints(ep, Endpoint(ipoint, ep.polytype))
+    epext = Endpoint(ipoint, ep.polytype)
+    link_endpoints(epext, right)
+    heapq.heappush(Q, ep.other)
+    heapq.heappush(Q, epext)
+
+
 def intersect_or_on(ep1, ep2):
     """Same as intersect(), except returns
     intersection even if degenerate.
@@ -190,40 +260,290 @@ def intersect_or_on(ep1, ep2):
 
 
 
+def connect_edges(segments):
+    """Joins (start, end) segments into closed rings, using a dict
+    from chain endpoints to the open chains ending there.
+    Rings are returned closed, ie with the first point repeated.
+    """
+    polys = []
+    ends = {} # point -> list of open chains with an end at point
+
+    def pop_end(point):
+        chains = ends.get(point)
+        if not chains:
+            return None
+        chain = chains.pop()
+        if not chains:
+            del ends[point]
+        return chain
+
+    def add_end(point, chain):
+        ends.setdefault(point, []).append(chain)
+
+    def drop_end(point, chain):
+        chains = ends[point]
+        chains.remove(chain)
+        if not chains:
+            del ends[point]
+
+    for a,b in segments:
+        chain_a = pop_end(a)
+        chain_b = pop_end(b)
+        if chain_a is None and chain_b is None:
+            chain = deque((a, b))
+            add_end(a, chain)
+            add_end(b, chain)
+        elif chain_a is chain_b:
+            # both ends meet, ring is closed
+            chain_a.append(chain_a[0])
+            polys.append(list(chain_a))
+        elif chain_b is None or chain_a is None:
+            chain, end, point = (chain_a, a, b) if chain_b is None else (chain_b, b, a)
+            if chain[-1] == end:
+                chain.append(point)
+            else:
+                chain.appendleft(point)
+            add_end(point, chain)
+        else:
+            # join two chains, the shorter one onto the longer
+            if len(chain_a) < len(chain_b):
+                chain_a, chain_b, a, b = chain_b, chain_a, b, a
+            far = chain_b[-1] if chain_b[0] == b else chain_b[0]
+            drop_end(far, chain_b)
+            seq = chain_b if chain_b[0] == b else reversed(chain_b)
+            if chain_a[-1] == a:
+                chain_a.extend(seq)
+            else:
+                chain_a.extendleft(seq)
+            add_end(far, chain_a)
+    return polys
+
+
+def ring_area(ring):
+    """Signed area of a closed ring (first point repeated)"""
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:])) / 2.0
+
+
+def point_in_ring(xy, ring):
+    """1 if xy is inside the closed ring, 0 if it's on its boundary,
+    and -1 if it's outside."""
+    x, y = xy
+    inside = False
+    for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+        if (y1 > y) != (y2 > y):
+            cross = (x2 - x1) * (y - y1) - (x - x1) * (y2 - y1)
+            if cross == 0:
+                return 0
+            if (cross > 0) == (y2 > y1):
+                inside = not inside
+        elif y1 == y2 == y and min(x1, x2) <= x <= max(x1, x2):
+            return 0
+        elif (x, y) == (x1, y1):
+            return 0
+    return 1 if inside else -1
+
+
+class PreparedRing:
+    """Point location index over the edges of a closed ring.
+
+    The edges are put in horizontal slabs covering their y range, so
+    locate() only looks at the edges in the slab of the point instead
+    of going around the whole ring like point_in_ring().
+    """
+
+    def __init__(self, ring):
+        edges = list(zip(ring, ring[1:]))
+        ys = [y for x, y in ring]
+        self.ymin, self.ymax = min(ys), max(ys)
+        # about one slab per edge, but fewer when the edges are tall
+        # so the index stays within a few entries per edge
+        spans = sum(abs(y2 - y1) for (x1, y1), (x2, y2) in edges) / ((self.ymax - self.ymin) or 1.0)
+        self.count = max(1, min(len(edges), int(4 * len(edges) / (spans or 1.0))))
+        self.height = (self.ymax - self.ymin) / float(self.count) or 1.0
+        self.slabs = [[] for _ in range(self.count)]
+        for edge in edges:
+            (x1, y1), (x2, y2) = edge
+            for k in range(self.slab(min(y1, y2)), self.slab(max(y1, y2)) + 1):
+                self.slabs[k].append(edge)
+
+    def slab(self, y):
+        return min(self.count - 1, max(0, int((y - self.ymin) / self.height)))
+
+    def locate(self, xy):
+        """Same as point_in_ring(xy, ring). Only edges whose y range
+        contains the point's y can change the result, and they are all
+        in its slab."""
+        x, y = xy
+        if y < self.ymin or y > self.ymax:
+            return -1
+        inside = False
+        for (x1, y1), (x2, y2) in self.slabs[self.slab(y)]:
+            if (y1 > y) != (y2 > y):
+                cross = (x2 - x1) * (y - y1) - (x - x1) * (y2 - y1)
+                if cross == 0:
+                    return 0
+                if (cross > 0) == (y2 > y1):
+                    inside = not inside
+            elif y1 == y2 == y and min(x1, x2) <= x <= max(x1, x2):
+                return 0
+            elif (x, y) == (x1, y1):
+                return 0
+        return 1 if inside else -1
+
+
+def nest_rings(polys):
+    """Groups closed rings into (exterior, holes) tuples.
+    Each ring's parent is the smallest larger ring containing it;
+    rings at odd depths are holes of their parent. Candidate parents
+    come from a uniform grid over the bounding boxes, and only those
+    whose box contains the ring's box get a point location test, on
+    a PreparedRing built the first time it's needed.
+    """
+    rings = sorted(polys, key=lambda ring: -abs(ring_area(ring)))
+    if not rings:
+        return []
+    bboxes = [bbox(ring) for ring in rings]
+    xmin = min(b[0] for b in bboxes)
+    ymin = min(b[1] for b in bboxes)
+    xmax = max(b[2] for b in bboxes)
+    ymax = max(b[3] for b in bboxes)
+    size = max(1, int(len(rings) ** 0.5))
+    cellw = (xmax - xmin) / float(size) or 1.0
+    cellh = (ymax - ymin) / float(size) or 1.0
+    def cell(x, y):
+        return (min(size - 1, int((x - xmin) / cellw)),
+                min(size - 1, int((y - ymin) / cellh)))
+    grid = dict()
+    prepared = dict()
+    depth = []
+    result = []
+    owner = [] # index into result of each exterior ring
+    for i, ring in enumerate(rings):
+        x1, y1, x2, y2 = bboxes[i]
+        parent = None
+        # a containing ring covers the cell of the box corner, and
+        # was added after any larger ones
+        for j in reversed(grid.get(cell(x1, y1), [])):
+            bx1, by1, bx2, by2 = bboxes[j]
+            if bx1 > x1 or by1 > y1 or bx2 < x2 or by2 < y2:
+                continue
+            if j not in prepared:
+                prepared[j] = PreparedRing(rings[j])
+            for xy in ring:
+                loc = prepared[j].locate(xy)
+                if loc:
+                    break
+            if loc > 0:
+                parent = j
+                break
+        if parent is not None and depth[parent] % 2 == 0:
+            depth.append(depth[parent] + 1)
+            owner.append(None)
+            result[owner[parent]][1].append(ring)
+        else:
+            depth.append(depth[parent] + 1 if parent is not None else 0)
+            owner.append(len(result))
+            result.append((ring, []))
+        cx1, cy1 = cell(x1, y1)
+        cx2, cy2 = cell(x2, y2)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                grid.setdefault((cx, cy), []).append(i)
+    return result
+
+
 # The algorithm
 
+def in_result(polytype, inside, type):
+    """Whether an edge belongs to the result of the given operation,
+    given if it lies inside the other polygon."""
+    if type == "intersect":
+        return inside
+    elif type == "union":
+        return not inside
+    elif type == "difference":
+        return inside == (polytype == "clip")
+    elif type == "xor":
+        return True
+    raise Exception("Unknown clip type: %s" % type)
+
+
+def bbox(points):
+    xs = [x for x,y in points]
+    ys = [y for x,y in points]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def slab_split(start, end, lo, hi):
+    """Splits off the part of an edge left of the vertical line x=lo.
+    Returns the parts outside of lo <= x <= hi and the remaining part
+    to be swept (or None). Edges crossing x=hi are kept whole, the
+    sweep needs them to classify vertical edges at hi.
+    """
+    (x1, y1), (x2, y2) = start, end
+    if x1 > x2:
+        (x1, y1), (x2, y2) = (x2, y2), (x1, y1)
+    if x2 < lo or x1 > hi:
+        return [(start, end)], None
+    if x1 < lo:
+        a = (lo, y1 + (y2 - y1) * (lo - x1) / float(x2 - x1))
+        return [((x1, y1), a)], (a, (x2, y2))
+    return [], (start, end)
+
+
 def clip_polygons(subject, clip, type):
 
+    # only edges crossing the x range shared by both polygons can
+    # intersect or lie inside the other polygon, ie the sweep can
+    # start at max(minx) and stop at min(maxx). Edges (or parts) outside
+    # that slab are outside the other polygon, so they go straight to
+    # the result or are dropped without creating any endpoints.
+    # Beyond min(maxx) only the right ends of edges crossing it remain,
+    # they can't intersect anything anymore so they're flushed at once.
+    sminx, sminy, smaxx, smaxy = bbox(subject)
+    cminx, cminy, cmaxx, cmaxy = bbox(clip)
+    lo, hi = max(sminx, cminx), min(smaxx, cmaxx)
+    if lo > hi or max(sminy, cminy) > min(smaxy, cmaxy):
+        lo, hi = float("inf"), float("-inf") # disjoint, nothing to sweep
+    elif sminx != cminx:
+        # cut halfway to the previous vertex rather than at lo itself,
+        # so the cut never lands on a vertical edge at lo
+        xs = [x for x,y in (subject if sminx < cminx else clip) if x < lo]
+        lo = (max(xs) + lo) / 2.0
+
     # insert all edge endpoints into the priority queue    
     Q = []
-    for start,end in pairwise(subject):
-        ep1 = Endpoint(start, "subject")
-        ep2 = Endpoint(end, "subject")
-        ep1.other = ep2
-        ep2.other = ep1
-        Q.append( ep1 )
-        Q.append( ep2 )
-    for start,end in pairwise(clip):
-        ep1 = Endpoint(start, "clip")
-        ep2 = Endpoint(end, "clip")
-        ep1.other = ep2
-        ep2.other = ep1
-        Q.append( ep1 )
-        Q.append( ep2 )
+    raw = []
+    for points,polytype in ((subject, "subject"), (clip, "clip")):
+        keep_outside = in_result(polytype, False, type)
+        for start,end in ring_edges(points):
+            outside, inner = slab_split(start, end, lo, hi)
+            if keep_outside:
+                raw.extend(outside)
+            if inner is None or inner[0] == inner[1]:
+                continue
+            ep1 = Endpoint(inner[0], polytype)
+            ep2 = Endpoint(inner[1], polytype)
+            link_endpoints(ep1, ep2)
+            Q.append( ep1 )
+            Q.append( ep2 )
         
-    # sort by x asc, y asc (bottom to top), and right endpoints first
-    Q = sorted(Q, key=lambda EP: (EP.x,EP.y,EP.left,EP.other.y))
-    for q in Q:
-        print("sorted",q)
+    # binary heap ordered by Endpoint.__lt__: x asc, y asc (bottom to top),
+    # right endpoints first, then the lower edge first
+    heapq.heapify(Q)
         
     # create the sweepline
     S = Sweepline()
 
     # loop
-    raw = []
     while Q:
-        endpoint = Q.pop(0)
-        print("processing",endpoint)
+        endpoint = heapq.heappop(Q)
+        if endpoint.x > hi:
+            for endpoint in [endpoint] + Q:
+                left = endpoint.other
+                if in_result(left.polytype, left.inside, type):
+                    raw.append((left.xy, endpoint.xy))
+            break
         if endpoint.left: # left endpoint
             # some lists
             S.insert(endpoint)
@@ -235,59 +555,25 @@ def clip_polygons(subject, clip, type):
         else: # right endpoint
             # move forward
             #S.find(endpoint.other)
-            next = S.next(endpoint.other)
-            prev = S.prev(endpoint.other)
+            if endpoint.other in S:
+                next = S.next(endpoint.other)
+                prev = S.prev(endpoint.other)
+            else:
+                next = prev = None
             #print prev,endpoint.other,next
             # some adding
-            if endpoint.inside:
-                raw.append(endpoint.xy) # intersection
-                raw.append(endpoint.other.xy)
-            elif not endpoint.inside:
-                raw.append(endpoint.xy) # union
-                raw.append(endpoint.other.xy)
+            left = endpoint.other
+            if in_result(left.polytype, left.inside, type):
+                raw.append((left.xy, endpoint.xy))
             # some cleanup
             #print "remove",endpoint.other,"from",[str(e) for e in S.edges]
             #S.erase(endpoint) if endpoint in S.edges else S.erase(endpoint.other)
-            if endpoint.other in S.edges: S.erase(endpoint.other) #right ends are processed before left, so could be the left hasnt been inserted yet
+            if endpoint.other in S: S.erase(endpoint.other) #right ends are processed before left, so could be the left hasnt been inserted yet
             possible_subdivide(prev, next, S, Q)
 
     # connect the final edges
-    polys = []
-    chains = []
-    for edge in pairwise(raw):
-        connect = []
-        for chain in chains:
-            if chain[0] in edge:
-                connect.append(chain)
-            elif chain[1] in edge:
-                connect.append(chain)
-
-        if len(connect) == 2:
-            chain1,chain2 = connect
-            chain1.extend(chain2)
-            chain1.extend(edge)
-            chains.remove(chain2)
-            if chain1[0] == chain1[-1]:
-                polys.append( chain1 )
-                chains.remove(chain1)
-
-        elif len(connect) == 1:
-            chain = connect[0]
-            chain.extend(edge)
-            if chain[0] == chain[-1]:
-                polys.append( chain )
-                chains.remove(chain)
-
-        else:
-            chain = list(edge)
-            chains.append(chain)
-
-    return [(p,[]) for p in polys]
-
-
-
-
-                
+    polys = connect_edges(raw)
+    return nest_rings(polys)
 
 
 if __name__ == "__main__":
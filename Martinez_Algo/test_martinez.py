@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from MartinezPolyClipping import connect_edges, nest_rings, point_in_ring, \
+    PreparedRing
+
+def _Square(x, y, size):
+    return [(x, y), (x + size, y), (x + size, y + size), (x, y + size), (x, y)]
+
+def _Canonical(ring):
+    # the points of a closed ring from its lowest one, in either direction
+    pts = ring[:-1]
+    i = pts.index(min(pts))
+    pts = pts[i:] + pts[:i]
+    return min(pts, [pts[0]] + pts[:0:-1])
+
+class ConnectEdgesTest(unittest.TestCase):
+
+    def testRings(self):
+        rings = [_Square(0, 0, 10), _Square(20, 0, 5)]
+        segments = [(a, b) for ring in rings for a, b in zip(ring, ring[1:])]
+        rnd = random.Random(1)
+        rnd.shuffle(segments)
+        segments = [(b, a) if rnd.random() < 0.5 else (a, b) for a, b in segments]
+        polys = connect_edges(segments)
+        self.assertEqual(len(polys), 2)
+        for poly in polys:
+            self.assertEqual(poly[0], poly[-1])
+        self.assertEqual(sorted(_Canonical(poly) for poly in polys),
+            sorted(_Canonical(ring) for ring in rings))
+
+    def testJoinChains(self):
+        # the last segment joins two open chains into one ring
+        ring = _Square(0, 0, 10)
+        segments = list(zip(ring, ring[1:]))
+        segments = [segments[0], segments[2], segments[3], segments[1]]
+        polys = connect_edges(segments)
+        self.assertEqual([_Canonical(poly) for poly in polys], [_Canonical(ring)])
+
+class NestRingsTest(unittest.TestCase):
+
+    def testNesting(self):
+        outer = _Square(0, 0, 100)
+        hole = _Square(10, 10, 50)
+        island = _Square(20, 20, 10)
+        islandHole = _Square(22, 22, 2)
+        other = _Square(200, 0, 10)
+        touching = _Square(60, 60, 10) # shares a corner with the hole
+        result = nest_rings([island, other, hole, touching, islandHole, outer])
+        self.assertEqual(result, [(outer, [hole, touching]),
+            (island, [islandHole]), (other, [])])
+
+    def testEmpty(self):
+        self.assertEqual(nest_rings([]), [])
+
+    def testSameAsPointInRing(self):
+        rnd = random.Random(2)
+        ring = [(rnd.randint(0, 20), rnd.randint(0, 20)) for i in range(30)]
+        ring.append(ring[0])
+        prepared = PreparedRing(ring)
+        points = ring + [(rnd.randint(-2, 22), rnd.randint(-2, 22))
+            for i in range(500)]
+        for xy in points:
+            self.assertEqual(prepared.locate(xy), point_in_ring(xy, ring), xy)
+
+if __name__ == '__main__':
+    unittest.main()
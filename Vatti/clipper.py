@@ -32,11 +32,20 @@
 #===============================================================================
 
 import math
+import time
+from array import array
 from collections import namedtuple
+from operator import attrgetter
+from heapq import heappush, heappop, merge
+from itertools import chain, count
 from decimal import Decimal, getcontext
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 getcontext().prec = 8
-horizontal = Decimal('-Infinity')
+horizontal = float('-inf')
 
 class ClipType: (Intersection, Union, Difference, Xor) = list(range(4))
 class PolyType:    (Subject, Clip) = list(range(2))
@@ -51,21 +60,13 @@ Point = namedtuple('Point', 'x y')
 DoublePoint = namedtuple('DoublePoint', 'x y')
 
 class LocalMinima(object):
-    leftBound = rightBound = nextLm = None
-    def __init__(self, y, leftBound, rightBound):
+    __slots__ = ('y','leftBound','rightBound','edges','bounds')
+    def __init__(self, y, leftBound, rightBound, edges):
         self.y = y
-        self.leftBound = leftBound
-        self.rightBound = rightBound
-
-class Scanbeam(object):
-    __slots__ = ('y','nextSb')
-    def __init__(self, y, nextSb = None):
-        self.y = y
-        self.nextSb = nextSb
-    def __repr__(self):
-        s = 'None'
-        if self.nextSb is not None: s = '<obj>'
-        return "(y:%i, nextSb:%s)" % (self.y, s)
+        self.leftBound = leftBound # the bottom edges of both bounds, as
+        self.rightBound = rightBound # indices into the EdgeStore edges
+        self.edges = edges
+        self.bounds = None # Rect of the polygon this minima belongs to
 
 class IntersectNode(object):
     __slots__ = ('e1','e2','pt','nextIn')
@@ -93,17 +94,39 @@ class OutRec(object):
         self.pts = None
         self.PolyNode = None
 
+class AreaRec(object):
+    # stands in for OutRec when only the area of the solution is wanted: 
+    # keeps the ends and bottom point of the output chain and its (doubled)
+    # shoelace and centroid sums instead of the points themselves
+    __slots__ = ('idx','isHole','FirstLeft','left','right','bottomPt',
+        'area','cx','cy')
+    def __init__(self, idx, pt):
+        self.idx = idx
+        self.isHole = False
+        self.FirstLeft = None
+        self.left = pt
+        self.right = pt
+        self.bottomPt = pt
+        self.area = 0
+        self.cx = 0
+        self.cy = 0
+
+    def _AddSegment(self, pt1, pt2):
+        cross = pt1.x * pt2.y - pt2.x * pt1.y
+        self.area += cross
+        self.cx += (pt1.x + pt2.x) * cross
+        self.cy += (pt1.y + pt2.y) * cross
+
 class JoinRec(object):
     __slots__ = ('pt1a','pt1b','poly1Idx','pt2a', 'pt2b','poly2Idx')
 
 class HorzJoin(object):
-    edge = None
-    savedIdx = 0
-    prevHj = None
-    nextHj = None
+    __slots__ = ('edge','savedIdx','prevHj','nextHj')
     def __init__(self, edge, idx):
         self.edge = edge
         self.savedIdx = idx
+        self.prevHj = None
+        self.nextHj = None
 
 #===============================================================================
 # Unit global functions ...
@@ -113,6 +136,15 @@ PRECISION = 1000000000
 
 def FloatPoints2IntPoints(points):
     precision = PRECISION
+    if numpy is not None and isinstance(points, numpy.ndarray):
+        # (N, 2) float array -> (N, 2) int64 array, truncated like int() ...
+        points = points * precision
+        if not (numpy.abs(points) < 2.0 ** 63).all():
+            # ... unless int64 would overflow, then Python ints (or the same
+            # errors as int() for infinities and NaNs) like the list path
+            return numpy.array([[int(x), int(y)] for x, y in points.tolist()], 
+                dtype = object).reshape(-1, 2)
+        return points.astype(numpy.int64)
     return [Point(int(point.x*precision),int(point.y*precision)) for point in points]
 
 def IntPoints2FloatPoints(points):
@@ -198,6 +230,35 @@ class PolyTree(PolyNode):
     def Total(self):
         return len(self._AllNodes)
 
+class PolygonBuffer(object):
+    """Flat solution container for Clipper.ExecuteToBuffer(). Ring i is
+    Coords[2*Offsets[i]:2*Offsets[i+1]] (x0, y0, x1, y1 ...) and lies 
+    directly inside ring Parents[i], or Parents[i] is -1. All three are 
+    array('q') so they can be shared with memoryview or numpy.frombuffer
+    without copying (coordinates must fit in 64 bits)."""
+
+    def __init__(self):
+        self.Clear()
+
+    def Clear(self):
+        self.Coords = array('q')
+        self.Offsets = array('q', [0])
+        self.Parents = array('q')
+
+    def RingCount(self):
+        return len(self.Parents)
+
+    def IsHole(self, i):
+        result = False
+        i = self.Parents[i]
+        while i >= 0:
+            result = not result
+            i = self.Parents[i]
+        return result
+
+    def GetRing(self, i):
+        return IntsToPoints(self.Coords[2*self.Offsets[i]:2*self.Offsets[i+1]])
+
 def _AddPolyNodeToPolygons(polynode, polygons):
     """Internal function for PolyTreeToPolygons()"""
     if (len(polynode.Contour) > 0):
@@ -215,22 +276,101 @@ def PolyTreeToPolygons(polyTree):
 #===============================================================================
 
 class Edge(object):
+    __slots__ = ('xBot','yBot','xCurr','yCurr','xTop','yTop',
+        'dx','deltaX','deltaY','PolyType','side',
+        'windDelta','windCnt','windCnt2','outIdx','nextInLML',
+        'prevInAEL','nextInAEL','prevInSEL','nextInSEL','store','idx')
 
     def __init__(self):
         self.xBot, self.yBot, self.xCurr, self.yCurr, = 0, 0, 0, 0
         self.xTop, self.yTop = 0, 0
-        self.dx, self.deltaX , self.deltaY = Decimal(0), Decimal(0), Decimal(0)
-        self.polyType = PolyType.Subject 
+        self.dx, self.deltaX , self.deltaY = 0, 0, 0
+        self.PolyType = PolyType.Subject 
         self.side = EdgeSide.Left
         self.windDelta, self.windCnt, self.windCnt2 = 0, 0, 0 
         self.outIdx = -1
-        self.nextE, self.prevE, self.nextInLML = None, None, None
+        self.nextInLML = None
         self.prevInAEL, self.nextInAEL, self.prevInSEL, self.nextInSEL = None, None, None, None
+        self.store, self.idx = None, -1 # where the edge's static data is kept
         
     def __repr__(self):
         return "(%i,%i . %i,%i {dx:%0.2f} %i {%x})" % \
             (self.xBot, self.yBot, self.xTop, self.yTop, self.dx, self.outIdx, id(self))
 
+class EdgeStore(object):
+    """The edges of the polygons added to a ClipperBase as parallel arrays,
+    indexed by edge number: bottom and top coordinates, winding direction, 
+    polygon type, and the next and previous edges of the ring and the next
+    edge up the bound (-1 for none). Edge objects are only made for the 
+    edges the sweep is working on, see NewEdge()."""
+    __slots__ = ('xBot','yBot','xTop','yTop','windDelta','PolyType',
+        'nextE','prevE','nextInLML','objects')
+
+    def __init__(self):
+        self.xBot, self.yBot = array('q'), array('q')
+        self.xTop, self.yTop = array('q'), array('q')
+        self.windDelta, self.PolyType = array('b'), array('b')
+        self.nextE, self.prevE = array('q'), array('q')
+        self.nextInLML = array('q')
+        self.objects = {} # the Edge objects of the current execution
+
+    def __len__(self):
+        return len(self.xBot)
+
+    def AddRing(self, xs, ys, polyType):
+        # adds an edge from each vertex to the next one and returns the 
+        # index of the first ...
+        first = len(self.xBot)
+        ln = len(xs)
+        xNext = xs[1:] + xs[:1]
+        yNext = ys[1:] + ys[:1]
+        up = [y >= y2 for y, y2 in zip(ys, yNext)]
+        columns = (
+            [x if u else x2 for u, x, x2 in zip(up, xs, xNext)],
+            [y if u else y2 for u, y, y2 in zip(up, ys, yNext)],
+            [x2 if u else x for u, x, x2 in zip(up, xs, xNext)],
+            [y2 if u else y for u, y, y2 in zip(up, ys, yNext)])
+        try:
+            for col, values in zip(self._Coords(), columns): col.extend(values)
+        except (OverflowError, TypeError):
+            # coordinates that aren't 64 bit integers are kept in lists
+            for col in self._Coords(): del col[first:]
+            self.xBot, self.yBot, self.xTop, self.yTop = \
+                [list(col) for col in self._Coords()]
+            for col, values in zip(self._Coords(), columns): col.extend(values)
+        self.windDelta.extend([1 if u else -1 for u in up])
+        self.PolyType.extend([polyType] * ln)
+        self.nextE.extend(range(first + 1, first + ln))
+        self.nextE.append(first)
+        self.prevE.append(first + ln - 1)
+        self.prevE.extend(range(first, first + ln - 1))
+        self.nextInLML.extend([-1] * ln)
+        return first
+
+    def _Coords(self):
+        return self.xBot, self.yBot, self.xTop, self.yTop
+
+    def SwapX(self, i):
+        self.xBot[i], self.xTop[i] = self.xTop[i], self.xBot[i]
+
+    def NewEdge(self, i):
+        # a new Edge object for edge i, positioned at its bottom (set up 
+        # here rather than in Edge.__init__, the sweep makes a lot of them)
+        e = Edge.__new__(Edge)
+        e.store, e.idx = self, i
+        e.xBot = e.xCurr = self.xBot[i]
+        e.yBot = e.yCurr = self.yBot[i]
+        e.xTop = self.xTop[i]
+        e.yTop = self.yTop[i]
+        _SetDx(e)
+        e.PolyType = self.PolyType[i]
+        e.side = EdgeSide.Left
+        e.windDelta, e.windCnt, e.windCnt2 = self.windDelta[i], 0, 0
+        e.outIdx = -1
+        e.nextInLML = None
+        e.prevInAEL = e.nextInAEL = e.prevInSEL = e.nextInSEL = None
+        return e
+
 #===============================================================================
 # ClipperBase class (+ data structs & ancilliary functions)
 #===============================================================================
@@ -247,12 +387,44 @@ def _SlopesEqual(pt1, pt2, pt3, pt4 = None):
 def _SlopesEqual2(e1, e2):
     return e1.deltaY * e2.deltaX == e1.deltaX * e2.deltaY
 
-def _SetDx(e):
+# Edge slopes are kept as exact integer deltas. dx is only a float used to
+# flag horizontals, slopes are ordered with integer cross-products and
+# _TopX/_IntersectPoint round exact quotients (ties to even, like round()).
+# The old Decimal arithmetic is still available via UseDecimalArithmetic().
+
+# int/int true division is correctly rounded, so round(n / d) is exact as
+# long as |n| stays below this bound (see _RoundDiv).
+_FLOAT_SAFE = 1 << 52
+
+def _RoundDiv(n, d):
+    if -_FLOAT_SAFE < n < _FLOAT_SAFE: return round(n / d)
+    if d < 0: n, d = -n, -d
+    q, r = divmod(n, d)
+    r += r
+    if r > d or (r == d and q & 1): q += 1
+    return q
+
+def _SetDxExact(e):
+    e.deltaX = e.xTop - e.xBot
+    e.deltaY = e.yTop - e.yBot
+    if e.deltaY == 0: e.dx = horizontal
+    else: e.dx = e.deltaX/e.deltaY
+
+def _DxLessExact(e1, e2):
+    # e1.dx < e2.dx (deltaY is never positive, horizontals sort first)
+    if e1.deltaY == 0: return e2.deltaY != 0
+    if e2.deltaY == 0: return False
+    return e1.deltaX * e2.deltaY < e2.deltaX * e1.deltaY
+
+def _SetDxDecimal(e):
     e.deltaX = Decimal(e.xTop - e.xBot)
     e.deltaY = Decimal(e.yTop - e.yBot)
     if e.deltaY == 0: e.dx = horizontal
     else: e.dx = e.deltaX/e.deltaY
 
+def _DxLessDecimal(e1, e2):
+    return e1.dx < e2.dx
+
 def _SwapSides(e1, e2):
     side    = e1.side
     e1.side = e2.side
@@ -263,102 +435,147 @@ def _SwapPolyIndexes(e1, e2):
     e1.outIdx = e2.outIdx
     e2.outIdx = idx
 
-def _InitEdge(e, eNext, ePrev, pt, polyType):
-    e.nextE = eNext
-    e.prevE = ePrev
-    e.xCurr = pt.x
-    e.yCurr = pt.y
-    if e.yCurr >= e.nextE.yCurr:
-        e.xBot = e.xCurr
-        e.yBot = e.yCurr
-        e.xTop = e.nextE.xCurr
-        e.yTop = e.nextE.yCurr
-        e.windDelta = 1
-    else:
-        e.xTop = e.xCurr
-        e.yTop = e.yCurr
-        e.xBot = e.nextE.xCurr
-        e.yBot = e.nextE.yCurr
-        e.windDelta = -1
-    _SetDx(e)
-    e.outIdx = -1
-    e.PolyType = polyType
-
-def _SwapX(e):
-    e.xCurr = e.xTop
-    e.xTop = e.xBot
-    e.xBot = e.xCurr
+def _CheckOffsets(offsets, ptCnt):
+    # offsets into a buffer of ptCnt points must be in order and in range
+    prev = 0
+    for offset in offsets:
+        if offset < prev or offset > ptCnt:
+            raise ValueError("polygon offsets must be in ascending order "
+                "and within the %d points of the buffer" % ptCnt)
+        prev = offset
+
+def _CleanRings(coords, offsets):
+    # Vectorised counterpart of the duplicate and co-linear vertex removal
+    # in AddPolygon, done for all the rings of a buffer at once. Returns the
+    # remaining coordinates and the number of vertices left in each ring.
+    ringCnt = len(offsets) -1
+    ring = numpy.repeat(numpy.arange(ringCnt), numpy.diff(offsets))
+    findDups = True
+    while len(coords):
+        counts = numpy.bincount(ring, minlength = ringCnt)
+        starts = numpy.cumsum(counts) - counts
+        idx = numpy.arange(len(coords))
+        first = starts[ring]
+        last = first + counts[ring] -1
+        nextIdx = numpy.where(idx == last, first, idx +1)
+        if findDups:
+            drop = (coords == coords[nextIdx]).all(axis = 1)
+        else:
+            prevIdx = numpy.where(idx == first, last, idx -1)
+            d1 = coords - coords[prevIdx]
+            d2 = coords[nextIdx] - coords
+            # floats only rule out co-linearity, the rest is checked exactly
+            f1 = d1.astype(numpy.float64)
+            f2 = d2.astype(numpy.float64)
+            a = f1[:, 0] * f2[:, 1]
+            b = f1[:, 1] * f2[:, 0]
+            drop = numpy.abs(a - b) <= (numpy.abs(a) + numpy.abs(b)) * 1e-14
+            for i in numpy.flatnonzero(drop).tolist():
+                if int(d1[i, 0]) * int(d2[i, 1]) != int(d1[i, 1]) * int(d2[i, 0]):
+                    drop[i] = False
+        if drop.any():
+            keep = ~drop
+            coords = coords[keep]
+            ring = ring[keep]
+            findDups = True
+        elif findDups: findDups = False
+        else: break
+    return coords, numpy.bincount(ring, minlength = ringCnt)
+
+def _PolyTypeBounds(minima):
+    # bounds of all the subject and of all the clip polygons (None if there
+    # are none), merged from the bounds of their local minima ...
+    totals = [None, None]
+    for lm in minima:
+        b = lm.bounds
+        polyType = lm.edges.PolyType[lm.leftBound]
+        t = totals[polyType]
+        if t is None: totals[polyType] = b
+        elif b.left < t.left or b.top < t.top or \
+            b.right > t.right or b.bottom > t.bottom:
+            totals[polyType] = Rect(min(b.left, t.left), 
+                min(b.top, t.top), max(b.right, t.right), 
+                max(b.bottom, t.bottom))
+    return totals
     
 class ClipperBase(object):
 
     def __init__(self):
-        self._EdgeList      = []       # 2D array
-        self._LocalMinList  = None     # single-linked list of LocalMinima
+        self._Edges         = EdgeStore()
+        self._LocalMinList  = []       # LocalMinima, sorted lazily by _Reset
+        self._MinimaSorted  = True
+        self._Prepared      = []       # attached PreparedPolygons
+        self._MinimaQueue   = []       # minima of the current run
         self._CurrentLocMin = None
+        self._CurrentLocMinIdx = 0
         
     def _InsertLocalMinima(self, lm):
-        if self._LocalMinList is None:
-            self._LocalMinList = lm
-        elif lm.y >= self._LocalMinList.y:
-            lm.nextLm = self._LocalMinList
-            self._LocalMinList = lm
-        else:
-            tmp = self._LocalMinList
-            while tmp.nextLm is not None and lm.y < tmp.nextLm.y:
-                    tmp = tmp.nextLm
-            lm.nextLm = tmp.nextLm
-            tmp.nextLm = lm
+        self._LocalMinList.append(lm)
+        self._MinimaSorted = False
+
+    def _SortLocalMinima(self):
+        # descending y, and among equal y the most recently added first ...
+        if self._MinimaSorted: return
+        self._LocalMinList.reverse()
+        self._LocalMinList.sort(key = attrgetter('y'), reverse = True)
+        self._MinimaSorted = True
 
     def _AddBoundsToLML(self, e):
-        e.nextInLML = None
-        e = e.nextE
+        s = self._Edges
+        xBot, yBot, xTop, yTop = s.xBot, s.yBot, s.xTop, s.yTop
+        nextE, prevE, nextInLML = s.nextE, s.prevE, s.nextInLML
+        nextInLML[e] = -1
+        e = nextE[e]
         while True:
-            if e.dx == horizontal:
-                if (e.nextE.yTop < e.yTop) and (e.nextE.xBot > e.prevE.xBot): break
-                if (e.xTop != e.prevE.xBot): _SwapX(e)
-                e.nextInLML = e.prevE
-            elif e.yBot == e.prevE.yBot: break
-            else: e.nextInLML = e.prevE
-            e = e.nextE
-
-        if e.dx == horizontal:
-            if (e.xBot != e.prevE.xBot): _SwapX(e)
-            lm = LocalMinima(e.prevE.yBot, e.prevE, e)
-        elif (e.dx < e.prevE.dx):
-            lm = LocalMinima(e.prevE.yBot, e.prevE, e)
+            if yBot[e] == yTop[e]:
+                if (yTop[nextE[e]] < yTop[e]) and \
+                    (xBot[nextE[e]] > xBot[prevE[e]]): break
+                if (xTop[e] != xBot[prevE[e]]): s.SwapX(e)
+                nextInLML[e] = prevE[e]
+            elif yBot[e] == yBot[prevE[e]]: break
+            else: nextInLML[e] = prevE[e]
+            e = nextE[e]
+
+        ePrev = prevE[e]
+        if yBot[e] == yTop[e]:
+            if (xBot[e] != xBot[ePrev]): s.SwapX(e)
+            lm = LocalMinima(yBot[ePrev], ePrev, e, s)
+        elif _DxLess(s.NewEdge(e), s.NewEdge(ePrev)):
+            lm = LocalMinima(yBot[ePrev], ePrev, e, s)
         else:
-            lm = LocalMinima(e.prevE.yBot, e, e.prevE)
-        lm.leftBound.side = EdgeSide.Left
-        lm.rightBound.side = EdgeSide.Right
+            lm = LocalMinima(yBot[ePrev], e, ePrev, s)
         self._InsertLocalMinima(lm)
         while True:
-            if e.nextE.yTop == e.yTop and e.nextE.dx != horizontal: break
-            e.nextInLML = e.nextE
-            e = e.nextE
-            if e.dx == horizontal and e.xBot != e.prevE.xTop: _SwapX(e)
-        return e.nextE
+            eNext = nextE[e]
+            if yTop[eNext] == yTop[e] and yBot[eNext] != yTop[eNext]: break
+            nextInLML[e] = eNext
+            e = eNext
+            if yBot[e] == yTop[e] and xBot[e] != xTop[prevE[e]]: s.SwapX(e)
+        return nextE[e]
 
     def _Reset(self):
-        lm = self._LocalMinList
-        if lm is not None: self._CurrentLocMin = lm
-        while lm is not None:
-            e = lm.leftBound
-            while e is not None:
-                e.xCurr    = e.xBot
-                e.yCurr    = e.yBot
-                e.side     = EdgeSide.Left
-                e.outIdx = -1
-                e = e.nextInLML
-            e = lm.rightBound
-            while e is not None:
-                e.xCurr    = e.xBot
-                e.yCurr    = e.yBot
-                e.side     = EdgeSide.Right
-                e.outIdx = -1
-                e = e.nextInLML
-            lm = lm.nextLm
+        self._SortLocalMinima()
+        if self._Prepared:
+            lists = [self._LocalMinList] + \
+                [prep._LocalMinList for prep in self._Prepared]
+            self._MinimaQueue = list(merge(*lists, 
+                key = attrgetter('y'), reverse = True))
+        else: self._MinimaQueue = self._LocalMinList
+        self._CullLocalMinima()
+        self._CurrentLocMinIdx = 0
+        if self._MinimaQueue: self._CurrentLocMin = self._MinimaQueue[0]
+        else: self._CurrentLocMin = None
+        # the sweep makes new Edge objects, drop any a previous execution 
+        # (of this or, for PreparedPolygons, another Clipper) left behind
+        self._Edges.objects = {}
+        for prep in self._Prepared: prep._Edges.objects = {}
             
+    def _CullLocalMinima(self):
+        pass
+
     def AddPolygon(self, polygon, polyType):
+        if numpy is not None and isinstance(polygon, numpy.ndarray):
+            return self.AddPolygonsFromBuffer(polygon, [0, len(polygon)], polyType)
         ln = len(polygon)
         if ln < 3: return False
         pg = polygon[:]
@@ -387,32 +604,29 @@ class ClipperBase(object):
             else: break
             ln -= 1
         if ln < 3: return False
-        edges = []
-        for i in range(ln):
-            edges.append(Edge())
-        edges[0].xCurr = pg[0].x
-        edges[0].yCurr = pg[0].y
-        _InitEdge(edges[ln-1], edges[0], edges[ln-2], pg[ln-1], polyType)
-        for i in range(ln-2, 0, -1):
-            _InitEdge(edges[i], edges[i+1], edges[i-1], pg[i], polyType)
-        _InitEdge(edges[0], edges[1], edges[ln-1], pg[0], polyType)
-        e = edges[0]
-        eHighest = e
-        while True:
-            e.xCurr = e.xBot
-            e.yCurr = e.yBot
-            if e.yTop < eHighest.yTop: eHighest = e
-            e = e.nextE
-            if e == edges[0]: break
+        return self._AddRing(
+            [pt.x for pt in pg[:ln]], [pt.y for pt in pg[:ln]], polyType)
+
+    def _AddRing(self, xs, ys, polyType):
+        # xs, ys: coordinates of a ring that's already free of duplicate and
+        # co-linear vertices ...
+        edges = self._Edges
+        first = edges.AddRing(xs, ys, polyType)
+        eHighest = min(range(first, first + len(xs)), key = edges.yTop.__getitem__)
         # make sure eHighest is positioned so the following loop works safely ...
-        if eHighest.windDelta > 0: eHighest = eHighest.nextE
-        if eHighest.dx == horizontal: eHighest = eHighest.nextE
+        if edges.windDelta[eHighest] > 0: eHighest = edges.nextE[eHighest]
+        if edges.yBot[eHighest] == edges.yTop[eHighest]: 
+            eHighest = edges.nextE[eHighest]
         # finally insert each local minima ...
+        lmCnt = len(self._LocalMinList)
         e = eHighest
         while True:
             e = self._AddBoundsToLML(e)
             if e == eHighest: break
-        self._EdgeList.append(edges)
+        bounds = Rect(min(xs), min(ys), max(xs), max(ys))
+        for i in range(lmCnt, len(self._LocalMinList)):
+            self._LocalMinList[i].bounds = bounds
+        return True
 
     def AddPolygons(self, polygons, polyType):
         result = False
@@ -420,19 +634,107 @@ class ClipperBase(object):
             if self.AddPolygon(p, polyType): result = True
         return result
 
+    def AddPolygonsFromBuffer(self, coords, offsets, polyType):
+        """Adds many polygons from one coordinate buffer: either an (N, 2) 
+        integer array or a flat x0, y0, x1, y1 ... sequence of N points. 
+        Polygon i is made of points offsets[i] to offsets[i+1]."""
+        if numpy is None:
+            return self._AddPolygonsFromList(coords, offsets, polyType)
+        coords = numpy.asarray(coords)
+        if coords.dtype.kind in 'fc':
+            raise TypeError("polygon coordinates must be integers, "
+                "see FloatPoints2IntPoints()")
+        if coords.dtype.kind not in 'iu' or (coords.size and 
+            max(-int(coords.min()), int(coords.max())) >= 1 << 62):
+            # values numpy can't handle exactly go through the list path ...
+            return self._AddPolygonsFromList(coords.reshape(-1).tolist(), 
+                numpy.asarray(offsets).tolist(), polyType)
+        # (all within +/-2^62 so this cast can't wrap around)
+        coords = coords.reshape(-1, 2).astype(numpy.int64)
+        offsets = numpy.asarray(offsets, numpy.int64)
+        _CheckOffsets(offsets.tolist(), len(coords))
+        if len(offsets) < 2: return False
+        # only the points the polygons are made of, offsets rebased to them
+        coords = coords[offsets[0]:offsets[-1]]
+        coords, counts = _CleanRings(coords, offsets - offsets[0])
+        xs = coords[:, 0].tolist()
+        ys = coords[:, 1].tolist()
+        result = False
+        i = 0
+        for cnt in counts.tolist():
+            if cnt >= 3: 
+                self._AddRing(xs[i:i+cnt], ys[i:i+cnt], polyType)
+                result = True
+            i += cnt
+        return result
+
+    def _AddPolygonsFromList(self, coords, offsets, polyType):
+        _CheckOffsets(offsets, len(coords) // 2)
+        result = False
+        for i in range(len(offsets) -1):
+            pts = IntsToPoints(coords[2*offsets[i]:2*offsets[i+1]])
+            if self.AddPolygon(pts, polyType): result = True
+        return result
+
+    def AddPrepared(self, prepared):
+        prepared._SortLocalMinima()
+        self._Prepared.append(prepared)
+        return len(prepared._LocalMinList) > 0
+
     def Clear(self):
-        self._EdgeList = []
-        self._LocalMinList    = None
+        self._Edges = EdgeStore()
+        self._LocalMinList  = []
+        self._MinimaSorted  = True
+        self._Prepared      = []
+        self._MinimaQueue   = []
         self._CurrentLocMin = None
+        self._CurrentLocMinIdx = 0
 
     def _PopLocalMinima(self):
         if self._CurrentLocMin is not None:
-            self._CurrentLocMin = self._CurrentLocMin.nextLm
+            self._CurrentLocMinIdx += 1
+            if self._CurrentLocMinIdx < len(self._MinimaQueue):
+                self._CurrentLocMin = self._MinimaQueue[self._CurrentLocMinIdx]
+            else: self._CurrentLocMin = None
+
+class PreparedPolygons(ClipperBase):
+    """Edges and local minima of a polygon set, built once and shared by 
+    any number of Clipper objects via Clipper.AddPrepared(). Only one of
+    those Clipper objects may be executing at any time."""
+    def __init__(self, polygons = None, polyType = PolyType.Subject):
+        ClipperBase.__init__(self)
+        if polygons is not None: self.AddPolygons(polygons, polyType)
+        self._SortLocalMinima()
 
 #===============================================================================
 # Clipper class (+ data structs & ancilliary functions)
 #===============================================================================
-def _IntersectPoint(edge1, edge2):
+def _IntersectPointExact(edge1, edge2):
+    if _SlopesEqual2(edge1, edge2):
+        if (edge2.yBot > edge1.yBot): y = edge2.yBot 
+        else: y = edge1.yBot
+        return Point(0, y), False
+    den = edge1.deltaX * edge2.deltaY - edge1.deltaY * edge2.deltaX
+    num = (edge2.xBot - edge1.xBot) * edge2.deltaY - \
+        (edge2.yBot - edge1.yBot) * edge2.deltaX
+    # (round the absolute coordinates like the Decimal path, rounding the 
+    # offset from edge1 would make ties depend on edge1 and argument order)
+    x = _RoundDiv(edge1.xBot * den + edge1.deltaX * num, den)
+    y = _RoundDiv(edge1.yBot * den + edge1.deltaY * num, den)
+    if (y < edge1.yTop) or (y < edge2.yTop):
+        if (edge1.yTop > edge2.yTop):
+            return Point(edge1.xTop,edge1.yTop), _TopX(edge2, edge1.yTop) < edge1.xTop
+        else:
+            return Point(edge2.xTop,edge2.yTop), _TopX(edge1, edge2.yTop) > edge2.xTop
+    else:
+        return Point(x,y), True
+
+def _TopXExact(e, currentY):
+    if currentY == e.yTop: return e.xTop
+    elif e.xTop == e.xBot: return e.xBot
+    else: return e.xBot + _RoundDiv(e.deltaX * (currentY - e.yBot), e.deltaY)
+
+def _IntersectPointDecimal(edge1, edge2):
     if _SlopesEqual2(edge1, edge2):
         if (edge2.yBot > edge1.yBot): y = edge2.yBot 
         else: y = edge1.yBot
@@ -468,11 +770,33 @@ def _IntersectPoint(edge1, edge2):
     else:
         return Point(x,y), True
 
-def _TopX(e, currentY):
+def _TopXDecimal(e, currentY):
     if currentY == e.yTop: return e.xTop
     elif e.xTop == e.xBot: return e.xBot
     else: return e.xBot + round(e.dx * Decimal(currentY - e.yBot))
 
+def _GetDxExact(pt1, pt2):
+    if (pt1.y == pt2.y): return horizontal
+    else: return (pt2.x - pt1.x)/(pt2.y - pt1.y)
+
+def _GetDxDecimal(pt1, pt2):
+    if (pt1.y == pt2.y): return horizontal
+    else: return Decimal(pt2.x - pt1.x)/(pt2.y - pt1.y)
+
+_SetDx, _DxLess, _TopX, _IntersectPoint, _GetDx = \
+    _SetDxExact, _DxLessExact, _TopXExact, _IntersectPointExact, _GetDxExact
+
+def UseDecimalArithmetic(enable = True):
+    """Switch edge slope arithmetic between exact integers (the default) and
+    the older Decimal implementation. Call it before adding any polygons."""
+    global _SetDx, _DxLess, _TopX, _IntersectPoint, _GetDx
+    if enable:
+        _SetDx, _DxLess, _TopX, _IntersectPoint, _GetDx = _SetDxDecimal, \
+            _DxLessDecimal, _TopXDecimal, _IntersectPointDecimal, _GetDxDecimal
+    else:
+        _SetDx, _DxLess, _TopX, _IntersectPoint, _GetDx = _SetDxExact, \
+            _DxLessExact, _TopXExact, _IntersectPointExact, _GetDxExact
+
 def _E2InsertsBeforeE1(e1,e2):
     if (e2.xCurr == e1.xCurr): 
         if (e2.yTop > e1.yTop):
@@ -482,7 +806,9 @@ def _E2InsertsBeforeE1(e1,e2):
         return e2.xCurr < e1.xCurr
 
 def _IsMinima(e):
-    return e is not None and e.prevE.nextInLML != e and e.nextE.nextInLML != e
+    if e is None: return False
+    s, i = e.store, e.idx
+    return s.nextInLML[s.prevE[i]] != i and s.nextInLML[s.nextE[i]] != i
 
 def _IsMaxima(e, y):
     return e is not None and e.yTop == y and e.nextInLML is None
@@ -491,10 +817,25 @@ def _IsIntermediate(e, y):
     return e.yTop == y and e.nextInLML is not None
 
 def _GetMaximaPair(e):
-    if not _IsMaxima(e.nextE, e.yTop) or e.nextE.xTop != e.xTop:
-        return e.prevE
-    else:
-        return e.nextE
+    s = e.store
+    i = s.nextE[e.idx]
+    if s.yTop[i] != e.yTop or s.nextInLML[i] >= 0 or s.xTop[i] != e.xTop:
+        i = s.prevE[e.idx]
+    pair = s.objects.get(i)
+    if pair is None: return s.NewEdge(i) # not in the AEL
+    return pair
+
+def _MakeEdge(store, i):
+    # the Edge object the sweep uses for edge i of store
+    e = store.NewEdge(i)
+    store.objects[i] = e
+    return e
+
+def _MakeNextInLML(e):
+    # Edge objects are made one edge ahead up the bound ...
+    i = e.store.nextInLML[e.idx]
+    if i < 0: e.nextInLML = None
+    else: e.nextInLML = _MakeEdge(e.store, i)
 
 def _GetnextInAEL(e, direction):
     if direction == Direction.LeftToRight: return e.nextInAEL
@@ -508,10 +849,6 @@ def _ProtectRight(val):
     if val: return Protects.Both
     else: return Protects.Left
 
-def _GetDx(pt1, pt2):
-    if (pt1.y == pt2.y): return horizontal
-    else: return Decimal(pt2.x - pt1.x)/(pt2.y - pt1.y)
-
 def _Param1RightOfParam2(outRec1, outRec2):
     while outRec1 is not None:
         outRec1 = outRec1.FirstLeft
@@ -725,11 +1062,99 @@ def _Poly2ContainsPoly1(outPt1, outPt2):
         while (pt != outPt1 and _PointOnPolygon(pt.pt, outPt2)):
             pt = pt.nextOp
         if (pt == outPt1): return True
-    return _PointInPolygon(pt.pt, outPt2)    
-    
-def _EdgesAdjacent(inode):
-    return (inode.e1.nextInSEL == inode.e2) or \
-        (inode.e1.prevInSEL == inode.e2)
+    return _PointInPolygon(pt.pt, outPt2)
+
+def _ReplayIntersectNodes(node):
+    # copies an intersection list of an earlier run onto the Edge objects
+    # of this run ...
+    head = prev = None
+    while node is not None:
+        e1, e2 = node.e1, node.e2
+        copy = IntersectNode(e1.store.objects[e1.idx],
+            e2.store.objects[e2.idx], node.pt)
+        if prev is None: head = copy
+        else: prev.nextIn = copy
+        prev = copy
+        node = node.nextIn
+    return head
+
+def _OrderIntersectNodes(nodes):
+    # Puts the crossings of a scanbeam in the order the old code processed 
+    # them. It found them with bubble sort passes over the SEL, inserted
+    # them into a list sorted by y and then moved forward the first node 
+    # whose edges were adjacent wherever the next node's edges weren't.
+    # Each step is rebuilt here in O(k log k).
+    involved = {}
+    for node in nodes:
+        involved[id(node.e1)] = node.e1
+        involved[id(node.e2)] = node.e2
+    # Any edge between two crossing edges crosses one of them, so the edges
+    # involved form runs in the AEL, ordered by their lowest xCurr.
+    runs = []
+    for e in involved.values():
+        if e.prevInAEL is not None and id(e.prevInAEL) in involved: continue
+        run = []
+        while e is not None and id(e) in involved:
+            run.append(e)
+            e = e.nextInAEL
+        runs.append((min(e.xCurr for e in run), run))
+    runs.sort(key = lambda run: run[0])
+    line = [e for _, run in runs for e in run]
+    pos = dict((id(e), i) for i, e in enumerate(line))
+    # A pass moves every edge one place left past the largest edge still on
+    # its left (the rightmost of equals), visiting them left to right.
+    crossings = {}
+    for node in nodes:
+        crossings.setdefault(id(node.e2), []).append(node)
+    passes = []
+    for crossing in crossings.values():
+        crossing.sort(key = lambda node: (node.e1.xCurr, pos[id(node.e1)]),
+            reverse = True)
+        i = pos[id(crossing[0].e2)]
+        for r, node in enumerate(crossing):
+            passes.append((r, i - r, node))
+    passes.sort(key = lambda p: p[:2])
+    # The sorted insert put equal y newest first, except that nodes at the
+    # y of the head went right behind it.
+    keys = {}
+    headY = None
+    for g, (_, _, node) in enumerate(passes):
+        y = node.pt.y
+        if headY is None or y > headY: 
+            headY = y
+            keys[id(node)] = (-y, 1, -g)
+        elif y == headY: keys[id(node)] = (-y, 2, -g)
+        else: keys[id(node)] = (-y, 0, -g)
+    order = sorted(nodes, key = lambda node: keys[id(node)])
+    # The fixup swapped a node whose edges weren't adjacent with the first
+    # later node whose edges were, so keep the adjacent ones in a heap by 
+    # their position in the list.
+    pairs = dict(((id(node.e1), id(node.e2)), node) for node in order)
+    index = dict((id(node), i) for i, node in enumerate(order))
+    heap, seq = [], count()
+    for e1, e2 in zip(line, line[1:]):
+        node = pairs.get((id(e1), id(e2)))
+        if node is not None: heappush(heap, (index[id(node)], next(seq), node))
+    for i in range(len(order)):
+        while True:
+            if not heap: return None
+            p, _, node = heappop(heap)
+            if index[id(node)] == p and \
+                pos[id(node.e1)] + 1 == pos[id(node.e2)]: break
+        if p != i:
+            order[p] = order[i]
+            order[i] = node
+            index[id(order[p])] = p
+        index[id(node)] = -1
+        j = pos[id(node.e1)]
+        line[j], line[j + 1] = node.e2, node.e1
+        pos[id(node.e2)], pos[id(node.e1)] = j, j + 1
+        for j in (j - 1, j + 1):
+            if j < 0 or j + 1 >= len(line): continue
+            node = pairs.get((id(line[j]), id(line[j + 1])))
+            if node is not None and index[id(node)] >= 0:
+                heappush(heap, (index[id(node)], next(seq), node))
+    return order
 
 def _UpdateOutPtIdxs(outrec):
     op = outrec.pts
@@ -738,6 +1163,51 @@ def _UpdateOutPtIdxs(outrec):
         op = op.prevOp
         if (op == outrec.pts): break
 
+class ExecuteStats(object):
+    """Phase timings (in seconds) and counters of a Clipper execution, 
+    gathered into Clipper.Stats when Clipper.CollectStats is set."""
+
+    def __init__(self):
+        self.ResetTime = 0.0
+        self.LocalMinimaTime = 0.0
+        self.HorizontalsTime = 0.0
+        self.IntersectionsTime = 0.0
+        self.TopOfScanbeamTime = 0.0
+        self.FixupTime = 0.0
+        self.JoinTime = 0.0
+        self.SimplifyTime = 0.0
+        self.TotalTime = 0.0
+        self.Scanbeams = 0
+        self.MaxActiveEdges = 0
+        self.IntersectNodes = 0
+        self.OutPts = 0      # before duplicate/co-linear point cleanup
+        self.OutRecs = 0
+        self.Joins = 0
+        self.Splits = 0      # polygons split off by joins or ForceSimple
+        self._start = self._lapStart = time.perf_counter()
+
+    def __repr__(self):
+        return "\n".join("%s: %s" % (k, getattr(self, k)) 
+            for k in sorted(vars(self)) if not k.startswith('_'))
+
+    def _Lap(self, phase = None):
+        # adds the time since the previous lap to the phase's time, if any
+        now = time.perf_counter()
+        if phase is not None:
+            setattr(self, phase, getattr(self, phase) + now - self._lapStart)
+        self._lapStart = now
+
+    def _CountActiveEdges(self, e):
+        aelCnt = 0
+        while e is not None:
+            aelCnt += 1
+            e = e.nextInAEL
+        if aelCnt > self.MaxActiveEdges: self.MaxActiveEdges = aelCnt
+        self._Lap()
+
+    def _Stop(self):
+        self.TotalTime = time.perf_counter() - self._start
+
 class Clipper(ClipperBase):
 
     def __init__(self):
@@ -745,10 +1215,12 @@ class Clipper(ClipperBase):
 
         self.ReverseOutput     = False
         self.ForceSimple       = False
+        self.CollectStats      = False
+        self.Stats             = None # ExecuteStats of the last execution
         
         self._PolyOutList = []        
         self._ClipType         = ClipType.Intersection
-        self._Scanbeam         = None
+        self._Scanbeam         = [] # heap of -y, duplicates dropped on pop
         self._ActiveEdges      = None
         self._SortedEdges      = None
         self._IntersectNodes   = None
@@ -756,39 +1228,65 @@ class Clipper(ClipperBase):
         self._SubjFillType     = PolyFillType.EvenOdd
         self._ExecuteLocked    = False
         self._UsingPolyTree    = False
+        self._AreaOnly         = False # AreaRecs instead of OutRecs
+        self._StopAtOutput     = False # predicates only need the first ...
+        self._OutputFound      = False # ... closed output polygon with area
+        self._StopY            = float('-inf') # or nothing left above it
         self._JoinList         = None
         self._HorzJoins        = None
+        self._IntersectLog     = None # intersections of each scanbeam ...
+        self._IntersectReplay  = None # ... and their replay in later runs
         
     def _Reset(self):
         ClipperBase._Reset(self)
-        self._Scanbeam = None
         self._PolyOutList = []
-        lm = self._LocalMinList
-        while lm is not None:
-            self._InsertScanbeam(lm.y)
-            lm = lm.nextLm
+        # minima are sorted by descending y so this is already a valid heap
+        self._Scanbeam = [-lm.y for lm in self._MinimaQueue]
+        # a predicate may have stopped the previous sweep half way ...
+        self._ActiveEdges = None
+        self._SortedEdges = None
 
     def Clear(self):
         self._PolyOutList = []
         ClipperBase.Clear(self)
 
+    def _CullLocalMinima(self):
+        # Polygons whose bounds miss those of the other polygon type can't 
+        # contribute to an intersection, and clip polygons missing the subject
+        # can't contribute to a difference, so they are left out of the sweep.
+        clipType = self._ClipType
+        if clipType not in (ClipType.Intersection, ClipType.Difference):
+            return
+        totals = _PolyTypeBounds(self._MinimaQueue)
+        if clipType == ClipType.Intersection and \
+            (totals[PolyType.Subject] is None or totals[PolyType.Clip] is None):
+            self._MinimaQueue = []
+            return
+        culled = []
+        for lm in self._MinimaQueue:
+            polyType = lm.edges.PolyType[lm.leftBound]
+            if polyType == PolyType.Subject:
+                if clipType == ClipType.Difference: 
+                    culled.append(lm)
+                    continue
+                other = totals[PolyType.Clip]
+            else: 
+                other = totals[PolyType.Subject]
+                if other is None: continue
+            b = lm.bounds
+            if b.right < other.left or b.left > other.right or \
+                b.bottom < other.top or b.top > other.bottom: continue
+            culled.append(lm)
+        self._MinimaQueue = culled
+
     def _InsertScanbeam(self, y):
-        if self._Scanbeam is None:
-            self._Scanbeam = Scanbeam(y)
-        elif y > self._Scanbeam.y:
-            self._Scanbeam = Scanbeam(y, self._Scanbeam)
-        else:
-            sb = self._Scanbeam
-            while sb.nextSb is not None and y <= sb.nextSb.y:
-                sb = sb.nextSb
-            if y == sb.y: return
-            newSb = Scanbeam(y, sb.nextSb)
-            sb.nextSb = newSb
+        heappush(self._Scanbeam, -y)
 
     def _PopScanbeam(self):
-        result = self._Scanbeam.y
-        self._Scanbeam = self._Scanbeam.nextSb
-        return result
+        sb = self._Scanbeam
+        result = heappop(sb)
+        while sb and sb[0] == result: heappop(sb)
+        return -result
 
     def _SetWindingCount(self, edge):
         e = edge.prevInAEL
@@ -897,14 +1395,6 @@ class Clipper(ClipperBase):
             self._SortedEdges.prevInSEL = edge
             self._SortedEdges = edge
 
-    def _CopyAELToSEL(self):
-        e = self._ActiveEdges
-        self._SortedEdges = e
-        while e is not None:
-            e.prevInSEL = e.prevInAEL
-            e.nextInSEL = e.nextInAEL
-            e = e.nextInAEL
-
     def _InsertEdgeIntoAEL(self, edge):
         edge.prevInAEL = None
         edge.nextInAEL = None
@@ -927,8 +1417,12 @@ class Clipper(ClipperBase):
     def _InsertLocalMinimaIntoAEL(self, botY):
         while self._CurrentLocMin is not None and \
                  self._CurrentLocMin.y == botY:
-            lb = self._CurrentLocMin.leftBound
-            rb = self._CurrentLocMin.rightBound
+            lm = self._CurrentLocMin
+            lb = _MakeEdge(lm.edges, lm.leftBound)
+            rb = _MakeEdge(lm.edges, lm.rightBound)
+            rb.side = EdgeSide.Right
+            _MakeNextInLML(lb)
+            _MakeNextInLML(rb)
             self._InsertEdgeIntoAEL(lb)
             self._InsertScanbeam(lb.yTop)
             self._InsertEdgeIntoAEL(rb)
@@ -962,7 +1456,8 @@ class Clipper(ClipperBase):
             
             if (lb.nextInAEL != rb):
                 
-                if rb.outIdx >= 0 and rb.prevInAEL.outIdx >= 0 and _SlopesEqual2(rb.prevInAEL, rb):
+                if rb.outIdx >= 0 and rb.prevInAEL.outIdx >= 0 and \
+                    not self._AreaOnly and _SlopesEqual2(rb.prevInAEL, rb):
                     self._AddJoin(rb, rb.prevInAEL)
                 
                 e = lb.nextInAEL
@@ -1066,7 +1561,7 @@ class Clipper(ClipperBase):
                     if horzEdge.outIdx >= 0 and e.outIdx >= 0:
                         self._AddJoin(horzEdge.nextInLML, e, horzEdge.outIdx)
                     break
-                elif e.dx < horzEdge.nextInLML.dx: break
+                elif _DxLess(e, horzEdge.nextInLML): break
             eNext = _GetnextInAEL(e, direction)
             if eMaxPair is not None or \
                 ((direction == Direction.LeftToRight) and (e.xCurr < horzRight)) or \
@@ -1113,6 +1608,8 @@ class Clipper(ClipperBase):
             self._ProcessHorizontal(e)
             
     def _AddJoin(self, e1, e2, e1OutIdx = -1, e2OutIdx = -1):
+        # (joins only reshape output polygons, never their total area)
+        if self._AreaOnly: return
         jr = JoinRec()
         if e1OutIdx >= 0: jr.poly1Idx = e1OutIdx
         else: jr.poly1Idx = e1.outIdx
@@ -1135,6 +1632,7 @@ class Clipper(ClipperBase):
                 jr2.poly2Idx = jr.poly2Idx
                 
     def _AddHorzJoin(self, e, idx):
+        if self._AreaOnly: return
         hj = HorzJoin(e, idx)
         if self._HorzJoins == None:
             self._HorzJoins = hj
@@ -1146,65 +1644,80 @@ class Clipper(ClipperBase):
             self._HorzJoins.prevHj.nextHj = hj
             self._HorzJoins.prevHj = hj
 
-    def _InsertIntersectNode(self, e1, e2, pt):
-        newNode = IntersectNode(e1, e2, pt)
-        if self._IntersectNodes is None:
-            self._IntersectNodes = newNode
-        elif newNode.pt.y > self._IntersectNodes.pt.y:
-            newNode.nextIn = self._IntersectNodes
-            self._IntersectNodes = newNode
-        else:
-            node = self._IntersectNodes
-            while node.nextIn is not None and \
-                newNode.pt.y < node.nextIn.pt.y:
-                node = node.nextIn
-            newNode.nextIn = node.nextIn
-            node.nextIn = newNode
-
-    def _ProcessIntersections(self, botY, topY):
+    def _ProcessIntersections(self, botY, topY, stats = None):
         try:
-            self._BuildIntersectList(botY, topY)
+            if not self._GetIntersectList(botY, topY): return False
             if self._IntersectNodes is None: return True
-            if self._IntersectNodes.nextIn is not None and \
-                not self._FixupIntersectionOrder(): return False 
+            if stats is not None:
+                node = self._IntersectNodes
+                while node is not None:
+                    stats.IntersectNodes += 1
+                    node = node.nextIn
             self._ProcessIntersectList()
             return True
         finally:
             self._IntersectNodes = None
             self._SortedEdges = None
+
+    def _GetIntersectList(self, botY, topY):
+        # The active edges move through the scanbeams in the same way for 
+        # every clip type, only their output differs, so ExecuteMany builds 
+        # the intersection lists in its first run and replays them later.
+        if self._IntersectReplay is not None:
+            self._IntersectNodes = _ReplayIntersectNodes(
+                next(self._IntersectReplay))
+            return True
+        if not self._BuildIntersectList(botY, topY): return False
+        if self._IntersectLog is not None: 
+            self._IntersectLog.append(self._IntersectNodes)
+        return True
+
+    def _PushIntersection(self, heap, seq, e, eNext, botY):
+        pt, intersected = _IntersectPoint(e, eNext)
+        if not intersected and e.xCurr > eNext.xCurr +1: 
+            raise Exception("Intersect Error")  
+        if pt.y > botY:
+            pt = Point(_TopX(e, botY), botY)
+        heappush(heap, (-pt.y, next(seq), e, eNext, pt))
             
     def _BuildIntersectList(self, botY, topY):
+        # Every crossing swaps a pair of edges that are adjacent in the SEL at
+        # that moment, so all of them are found by repeatedly swapping the
+        # lowest crossing among currently adjacent, out of order pairs, in 
+        # O((n + k) log n). The nodes are then put back in the order the old
+        # bubble sort passes and _FixupIntersectionOrder gave them, since 
+        # crossings at equal y change the output when taken in another order.
         e = self._ActiveEdges
-        if e is None: return
+        if e is None: return True
         self._SortedEdges = e
+        heap, seq = [], count()
         while e is not None:
             e.prevInSEL = e.prevInAEL
             e.nextInSEL = e.nextInAEL
             e.xCurr = _TopX(e, topY)
+            if e.prevInAEL is not None and e.prevInAEL.xCurr > e.xCurr:
+                self._PushIntersection(heap, seq, e.prevInAEL, e, botY)
             e = e.nextInAEL
-        while True:
-            isModified = False
-            e = self._SortedEdges
-            while e.nextInSEL is not None:
-                eNext = e.nextInSEL
-                if e.xCurr <= eNext.xCurr:
-                    e = eNext
-                    continue
-                pt, intersected = _IntersectPoint(e, eNext)
-                if not intersected and e.xCurr > eNext.xCurr +1: 
-                    raise Exception("Intersect Error")  
-                if pt.y > botY:
-                    pt = Point(_TopX(e, botY), botY)
-                self._InsertIntersectNode(e, eNext, pt)
-                self._SwapPositionsInSEL(e, eNext)
-                isModified = True
-            if e.prevInSEL is not None:
-                e.prevInSEL.nextInSEL = None
-            else:
-                break
-            if not isModified: break
-        self._SortedEdges = None
-        return
+        if not heap: return True
+        nodes = []
+        while heap:
+            _, _, e, eNext, pt = heappop(heap)
+            if e.nextInSEL is not eNext: continue
+            nodes.append(IntersectNode(e, eNext, pt))
+            self._SwapPositionsInSEL(e, eNext)
+            ePrev = eNext.prevInSEL
+            if ePrev is not None and ePrev.xCurr > eNext.xCurr:
+                self._PushIntersection(heap, seq, ePrev, eNext, botY)
+            eNext = e.nextInSEL
+            if eNext is not None and e.xCurr > eNext.xCurr:
+                self._PushIntersection(heap, seq, e, eNext, botY)
+        if len(nodes) > 1:
+            nodes = _OrderIntersectNodes(nodes)
+            if nodes is None: return False
+        for node, nextNode in zip(nodes, nodes[1:]):
+            node.nextIn = nextNode
+        self._IntersectNodes = nodes[0]
+        return True
 
     def _ProcessIntersectList(self):
         while self._IntersectNodes is not None:
@@ -1226,6 +1739,7 @@ class Clipper(ClipperBase):
             aelNext.prevInAEL = aelPrev
         e.nextInAEL = None
         e.prevInAEL = None
+        e.store.objects.pop(e.idx, None)
 
     def _DeleteFromSEL(self, e):
         SELPrev = e.prevInSEL
@@ -1381,7 +1895,9 @@ class Clipper(ClipperBase):
         e.nextInLML.windDelta = e.windDelta
         e.nextInLML.windCnt = e.windCnt
         e.nextInLML.windCnt2 = e.windCnt2
+        e.store.objects.pop(e.idx, None)
         e = e.nextInLML
+        _MakeNextInLML(e)
         e.prevInAEL = aelPrev
         e.nextInAEL = aelNext
         if e.dx != horizontal:
@@ -1389,7 +1905,7 @@ class Clipper(ClipperBase):
         return e
 
     def _AddLocalMinPoly(self, e1, e2, pt):
-        if e2.dx == horizontal or e1.dx > e2.dx:
+        if e2.dx == horizontal or _DxLess(e2, e1):
             self._AddOutPt(e1, pt)
             e2.outIdx = e1.outIdx
             e1.side = EdgeSide.Left
@@ -1406,7 +1922,7 @@ class Clipper(ClipperBase):
             if e.prevInAEL == e1: prevE = e1.prevInAEL
             else: prevE = e.prevInAEL
 
-        if prevE is not None and prevE.outIdx >= 0 and \
+        if prevE is not None and prevE.outIdx >= 0 and not self._AreaOnly and \
             _TopX(prevE, pt.y) == _TopX(e, pt.y) and \
            _SlopesEqual2(e, prevE): 
                 self._AddJoin(e, prevE)
@@ -1415,6 +1931,12 @@ class Clipper(ClipperBase):
     def _AddLocalMaxPoly(self, e1, e2, pt):
         self._AddOutPt(e1, pt)
         if e1.outIdx == e2.outIdx:
+            if self._AreaOnly:
+                areaRec = self._PolyOutList[e1.outIdx]
+                areaRec._AddSegment(areaRec.right, areaRec.left)
+                # (coincident edges can make chains that cancel out) 
+                if self._StopAtOutput and areaRec.area != 0:
+                    self._OutputFound = True
             e1.outIdx = -1
             e2.outIdx = -1
         elif e1.outIdx < e2.outIdx:
@@ -1428,6 +1950,7 @@ class Clipper(ClipperBase):
         return outRec
     
     def _AddOutPt(self, e, pt):
+        if self._AreaOnly: return self._AddAreaPt(e, pt)
         toFront = e.side == EdgeSide.Left
         if e.outIdx < 0:
             outRec = self._CreateOutRec();
@@ -1449,7 +1972,84 @@ class Clipper(ClipperBase):
             op.prevOp = op2
             if toFront: outRec.pts = op2
         
+    def _AddAreaPt(self, e, pt):
+        if e.outIdx < 0:
+            areaRec = AreaRec(len(self._PolyOutList), pt)
+            self._PolyOutList.append(areaRec)
+            e.outIdx = areaRec.idx
+            _SetHoleState(e, areaRec, self._PolyOutList)
+        else:
+            areaRec = self._PolyOutList[e.outIdx]
+            if e.side == EdgeSide.Left:
+                areaRec._AddSegment(pt, areaRec.left)
+                areaRec.left = pt
+            else:
+                areaRec._AddSegment(areaRec.right, pt)
+                areaRec.right = pt
+            btmPt = areaRec.bottomPt
+            if pt.y > btmPt.y or (pt.y == btmPt.y and pt.x < btmPt.x):
+                areaRec.bottomPt = pt
+
+    def _AppendAreaRec(self, e1, e2):
+        # the chain ends are linked as in _AppendPolygon, the segment joining
+        # them being the one (reversed or not) that ends the second chain 
+        areaRec1 = self._PolyOutList[e1.outIdx]
+        areaRec2 = self._PolyOutList[e2.outIdx]
+        btmPt1 = areaRec1.bottomPt
+        btmPt2 = areaRec2.bottomPt
+        lowerRec2 = btmPt2.y > btmPt1.y or \
+            (btmPt2.y == btmPt1.y and btmPt2.x < btmPt1.x)
+        if lowerRec2: areaRec1.bottomPt = btmPt2
+        if _Param1RightOfParam2(areaRec1, areaRec2): holeStateRec = areaRec2
+        elif _Param1RightOfParam2(areaRec2, areaRec1): holeStateRec = areaRec1
+        elif lowerRec2: holeStateRec = areaRec2
+        else: holeStateRec = areaRec1
+
+        reverse = e1.side == e2.side
+        if e1.side == EdgeSide.Left:
+            if reverse:
+                areaRec1._AddSegment(areaRec2.left, areaRec1.left)
+                areaRec1.left = areaRec2.right
+            else:
+                areaRec1._AddSegment(areaRec2.right, areaRec1.left)
+                areaRec1.left = areaRec2.left
+        else:
+            if reverse:
+                areaRec1._AddSegment(areaRec1.right, areaRec2.right)
+                areaRec1.right = areaRec2.left
+            else:
+                areaRec1._AddSegment(areaRec1.right, areaRec2.left)
+                areaRec1.right = areaRec2.right
+        if reverse:
+            areaRec1.area -= areaRec2.area
+            areaRec1.cx -= areaRec2.cx
+            areaRec1.cy -= areaRec2.cy
+        else:
+            areaRec1.area += areaRec2.area
+            areaRec1.cx += areaRec2.cx
+            areaRec1.cy += areaRec2.cy
+        areaRec2.area = areaRec2.cx = areaRec2.cy = 0
+
+        if holeStateRec == areaRec2:
+            if areaRec2.FirstLeft != areaRec1:
+                areaRec1.FirstLeft = areaRec2.FirstLeft
+            areaRec1.isHole = areaRec2.isHole
+        areaRec2.FirstLeft = areaRec1
+        ObsoleteIdx = areaRec2.idx
+        e1.outIdx = -1
+        e2.outIdx = -1
+
+        e = self._ActiveEdges
+        while e is not None:
+            if e.outIdx == ObsoleteIdx:
+                e.outIdx = areaRec1.idx
+                e.side = e1.side
+                break
+            e = e.nextInAEL
+        areaRec2.idx = areaRec1.idx
+
     def _AppendPolygon(self, e1, e2):
+        if self._AreaOnly: return self._AppendAreaRec(e1, e2)
         outRec1 = self._PolyOutList[e1.outIdx]
         outRec2 = self._PolyOutList[e2.outIdx]
         holeStateRec = None
@@ -1518,29 +2118,6 @@ class Clipper(ClipperBase):
             e = e.nextInAEL
         outRec2.idx = outRec1.idx    
         
-    def _FixupIntersectionOrder(self):
-        self._CopyAELToSEL()
-        inode = self._IntersectNodes
-        while inode is not None:
-            if (not _EdgesAdjacent(inode)):
-                nextNode = inode.nextIn
-                while (nextNode and not _EdgesAdjacent(nextNode)):
-                    nextNode = nextNode.nextIn
-                if (nextNode is None): return False
-                e1 = inode.e1
-                e2 = inode.e2
-                p = inode.pt
-                inode.e1 = nextNode.e1
-                inode.e2 = nextNode.e2
-                inode.pt = nextNode.pt
-                nextNode.e1 = e1
-                nextNode.e2 = e2
-                nextNode.pt = p
-        
-            self._SwapPositionsInSEL(inode.e1, inode.e2);
-            inode = inode.nextIn
-        return True
-                                
     def _ProcessEdgesAtTopOfScanbeam(self, topY):
         e = self._ActiveEdges
         while e is not None:
@@ -1810,36 +2387,70 @@ class Clipper(ClipperBase):
                 if op == outrec.pts: break
         return
                 
+    def _FixupOutPolygons(self):
+        for outRec in self._PolyOutList:
+            if outRec.pts is None: continue                
+            _FixupOutPolygon(outRec)
+            if outRec.pts is None: continue
+            if outRec.isHole == (self._Area(outRec.pts) > 0.0):
+                _ReversePolyPtLinks(outRec.pts)
+
     def _ExecuteInternal(self):
+        # with CollectStats set, each phase is also timed into self.Stats
+        stats = None
+        if self.CollectStats: stats = self.Stats = ExecuteStats()
         try: 
             try:
                 self._Reset()
-                if self._Scanbeam is None: return True
+                if stats is not None: stats._Lap('ResetTime')
+                if not self._Scanbeam: return True
                 botY = self._PopScanbeam()
                 while True:
                     self._InsertLocalMinimaIntoAEL(botY)
+                    if stats is not None: 
+                        stats.Scanbeams += 1
+                        stats._Lap('LocalMinimaTime')
                     self._HorzJoins = None
                     self._ProcessHorizontals()
                     topY = self._PopScanbeam()
-                    if not self._ProcessIntersections(botY, topY): return False
+                    if stats is not None: 
+                        stats._Lap('HorizontalsTime')
+                        stats._CountActiveEdges(self._ActiveEdges)
+                    if not self._ProcessIntersections(botY, topY, stats): return False
+                    if stats is not None: stats._Lap('IntersectionsTime')
                     self._ProcessEdgesAtTopOfScanbeam(topY)
+                    if stats is not None: stats._Lap('TopOfScanbeamTime')
                     botY = topY
-                    if self._Scanbeam is None and self._CurrentLocMin is None: break
+                    if self._OutputFound or botY <= self._StopY or \
+                        (not self._Scanbeam and self._CurrentLocMin is None): break
                     
-                for outRec in self._PolyOutList:
-                    if outRec.pts is None: continue                
-                    _FixupOutPolygon(outRec)
-                    if outRec.pts is None: continue
-                    if outRec.isHole == (self._Area(outRec.pts) > 0.0):
-                        _ReversePolyPtLinks(outRec.pts)
-                
-                if self._JoinList is not None: self._JoinCommonEdges()
-                if self.ForceSimple: self._DoSimplePolygons()
+                if stats is not None: stats.OutRecs = len(self._PolyOutList)
+                if self._AreaOnly: return True
+                if stats is not None:
+                    for outRec in self._PolyOutList:
+                        stats.OutPts += _PointCount(outRec.pts)
+                    stats._Lap()
+                self._FixupOutPolygons()
+                if stats is not None: stats._Lap('FixupTime')
+                if self._JoinList is not None: 
+                    outRecCnt = len(self._PolyOutList)
+                    if stats is not None: stats.Joins = len(self._JoinList)
+                    self._JoinCommonEdges()
+                    if stats is not None: 
+                        stats._Lap('JoinTime')
+                        stats.Splits += len(self._PolyOutList) - outRecCnt
+                if self.ForceSimple: 
+                    outRecCnt = len(self._PolyOutList)
+                    self._DoSimplePolygons()
+                    if stats is not None: 
+                        stats._Lap('SimplifyTime')
+                        stats.Splits += len(self._PolyOutList) - outRecCnt
                 
                 return True
             finally:
                 self._JoinList = None
                 self._HorzJoins = None
+                if stats is not None: stats._Stop()
         except:
             return False
 
@@ -1885,6 +2496,227 @@ class Clipper(ClipperBase):
             self._UsingPolyTree = False
         return result
 
+    def ExecuteToBuffer(
+            self,
+            clipType,
+            solutionBuffer,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        if self._ExecuteLocked: return False
+        try:
+            self._ExecuteLocked = True
+            self._UsingPolyTree = True
+            solutionBuffer.Clear()
+            self._SubjFillType = subjFillType
+            self._ClipFillType = clipFillType
+            self._ClipType = clipType
+            result = self._ExecuteInternal()
+            if result: self._BuildResult3(solutionBuffer)
+        finally:
+            self._ExecuteLocked = False
+            self._UsingPolyTree = False
+        return result
+
+    def ExecuteMany(
+            self,
+            clipTypes,
+            solutions,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # Executes each clip type in clipTypes into the solution list at the 
+        # same position in solutions, with the same result as Execute. Runs
+        # can only share the intersections of a sweep over the same local
+        # minima, and Execute culls them differently for intersections, for
+        # differences and for the other clip types (see _CullLocalMinima), 
+        # so of each of those three groups only the first run searches for
+        # intersections and the others replay them. Returns False as soon 
+        # as one of the runs fails, or when clipTypes and solutions differ 
+        # in length.
+        if self._ExecuteLocked: return False
+        clipTypes, solutions = list(clipTypes), list(solutions)
+        if len(clipTypes) != len(solutions): return False
+        try:
+            self._ExecuteLocked = True
+            self._UsingPolyTree = True
+            self._SubjFillType = subjFillType
+            self._ClipFillType = clipFillType
+            logs = {}
+            result = True
+            for clipType, solution in zip(clipTypes, solutions):
+                del solution[:]
+                self._ClipType = clipType
+                if clipType in (ClipType.Intersection, ClipType.Difference):
+                    cull = clipType
+                else: cull = None
+                if cull in logs:
+                    self._IntersectLog = None
+                    self._IntersectReplay = iter(logs[cull])
+                else:
+                    self._IntersectLog = logs[cull] = []
+                    self._IntersectReplay = None
+                result = self._ExecuteInternal()
+                if not result: break
+                self._BuildResult(solution)
+        finally:
+            self._ExecuteLocked = False
+            self._UsingPolyTree = False
+            self._IntersectLog = None
+            self._IntersectReplay = None
+        return result
+
+    def ExecuteArea(
+            self,
+            clipType,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # Returns the area of the solution of clipType without building it
+        # (holes are subtracted), or None if the execution fails.
+        result = self._ExecuteAreaInternal(clipType, subjFillType, clipFillType)
+        if result is None: return None
+        return result[0] / 2.0
+
+    def ExecuteCentroid(
+            self,
+            clipType,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # Returns the area and centroid (a DoublePoint, None for an empty 
+        # solution) of the solution of clipType without building it, or None 
+        # if the execution fails.
+        result = self._ExecuteAreaInternal(clipType, subjFillType, clipFillType)
+        if result is None: return None
+        area, cx, cy = result
+        if area == 0: return 0.0, None
+        return area / 2.0, DoublePoint(cx / (3.0 * area), cy / (3.0 * area))
+
+    def _ExecuteAreaInternal(self, clipType, subjFillType, clipFillType):
+        # the doubled area and the centroid sums of all the output chains, 
+        # accumulated while sweeping instead of adding output points
+        if self._ExecuteLocked: return None
+        try:
+            self._ExecuteLocked = True
+            self._AreaOnly = True
+            self._SubjFillType = subjFillType
+            self._ClipFillType = clipFillType
+            self._ClipType = clipType
+            if not self._ExecuteInternal(): return None
+            # orient the chains as _FixupOutPolygons does, holes negative
+            area = cx = cy = 0
+            for areaRec in self._PolyOutList:
+                if areaRec.isHole == (areaRec.area > 0):
+                    area -= areaRec.area
+                    cx -= areaRec.cx
+                    cy -= areaRec.cy
+                else:
+                    area += areaRec.area
+                    cx += areaRec.cx
+                    cy += areaRec.cy
+            return area, cx, cy
+        finally:
+            self._PolyOutList = []
+            self._ExecuteLocked = False
+            self._AreaOnly = False
+
+    def Intersects(
+            self,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # True if the subject and clip regions overlap (more than touch), 
+        # None if the execution fails. The sweep stops once the first piece 
+        # of their intersection is closed or it leaves the bounds shared by 
+        # both polygon types, and polygons outside the bounds of the other 
+        # polygon type are culled before it starts.
+        subj, clip = self._AllPolyTypeBounds()
+        if subj is None or clip is None: return False
+        return self._ExecutePredicate(ClipType.Intersection, 
+            subjFillType, clipFillType, max(subj.top, clip.top))
+
+    def Within(
+            self,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # True if the subject region lies within the clip region, None if the
+        # execution fails. The sweep stops once the first piece of subject 
+        # outside the clip is closed or it leaves the subject bounds, and 
+        # subject bounds reaching outside the clip bounds answer without 
+        # sweeping at all.
+        subj, clip = self._AllPolyTypeBounds()
+        if subj is None: return True
+        if subjFillType in (PolyFillType.EvenOdd, PolyFillType.NonZero):
+            # (the outermost vertices of a ring are always filled with these)
+            if clip is None or subj.left < clip.left or \
+                subj.top < clip.top or subj.right > clip.right or \
+                subj.bottom > clip.bottom: return False
+        outside = self._ExecutePredicate(
+            ClipType.Difference, subjFillType, clipFillType, subj.top)
+        if outside is None: return None
+        return not outside
+
+    def Touches(
+            self,
+            subjFillType = PolyFillType.EvenOdd,
+            clipFillType = PolyFillType.EvenOdd):
+        # True if the subject and clip boundaries meet but their regions 
+        # don't overlap, None if the execution fails. Boundaries of simple 
+        # polygons can't cross without their regions overlapping, so once 
+        # Intersects() is False it's enough to look for a vertex of either 
+        # type on an edge of the other, inside the overlap of their bounds.
+        subj, clip = self._AllPolyTypeBounds()
+        if subj is None or clip is None or \
+            subj.right < clip.left or subj.left > clip.right or \
+            subj.bottom < clip.top or subj.top > clip.bottom: return False
+        overlap = self.Intersects(subjFillType, clipFillType)
+        if overlap is None: return None
+        if overlap: return False
+        left = max(subj.left, clip.left)
+        top = max(subj.top, clip.top)
+        right = min(subj.right, clip.right)
+        bottom = min(subj.bottom, clip.bottom)
+        pts = ([], [])
+        edges = ([], [])
+        stores = [self._Edges] + [prep._Edges for prep in self._Prepared]
+        for s in stores:
+            for i in range(len(s)):
+                if s.yBot[i] < top or s.yTop[i] > bottom or \
+                    max(s.xBot[i], s.xTop[i]) < left or \
+                    min(s.xBot[i], s.xTop[i]) > right: continue
+                e = s.NewEdge(i)
+                edges[e.PolyType].append(e)
+                # (local maxima are only ever the top of an edge)
+                for x, y in ((e.xBot, e.yBot), (e.xTop, e.yTop)):
+                    if left <= x <= right and top <= y <= bottom:
+                        pts[e.PolyType].append(Point(x, y))
+        return _VerticesOnEdges(pts[PolyType.Subject], edges[PolyType.Clip]) or \
+            _VerticesOnEdges(pts[PolyType.Clip], edges[PolyType.Subject])
+
+    def _AllPolyTypeBounds(self):
+        return _PolyTypeBounds(chain(self._LocalMinList, 
+            *[prep._LocalMinList for prep in self._Prepared]))
+
+    def _ExecutePredicate(self, clipType, subjFillType, clipFillType, stopY):
+        # whether the solution of clipType would have any area, sweeping 
+        # only until the first output polygon of non-zero area is closed or
+        # past stopY, above which the solution can't have any points
+        if self._ExecuteLocked: return None
+        try:
+            self._ExecuteLocked = True
+            self._AreaOnly = True
+            self._StopAtOutput = True
+            self._OutputFound = False
+            self._StopY = stopY
+            self._SubjFillType = subjFillType
+            self._ClipFillType = clipFillType
+            self._ClipType = clipType
+            if not self._ExecuteInternal(): return None
+            return self._OutputFound
+        finally:
+            self._PolyOutList = []
+            self._ExecuteLocked = False
+            self._AreaOnly = False
+            self._StopAtOutput = False
+            self._OutputFound = False
+            self._StopY = float('-inf')
+
     def _BuildResult(self, polygons):
         for outRec in self._PolyOutList:
             if outRec is None: continue
@@ -1923,6 +2755,49 @@ class Clipper(ClipperBase):
                 outRec.FirstLeft.PolyNode._AddChild(outRec.PolyNode)                 
         return
 
+    def _BuildResult3(self, buffer):
+        coords = buffer.Coords
+        offsets = buffer.Offsets
+        ringIdx = {}
+        rings = []
+        for outRec in self._PolyOutList:
+            if outRec is None: continue
+            cnt = _PointCount(outRec.pts)
+            if (cnt < 3): continue
+            _FixHoleLinkage(outRec)
+            ringIdx[outRec.idx] = len(rings)
+            rings.append(outRec)
+            op = outRec.pts
+            for _ in range(cnt):
+                coords.append(op.pt.x)
+                coords.append(op.pt.y)
+                op = op.prevOp
+            offsets.append(len(coords) // 2)
+        for outRec in rings:
+            orfl = outRec.FirstLeft
+            while orfl is not None and orfl.idx not in ringIdx:
+                orfl = orfl.FirstLeft
+            if orfl is None: buffer.Parents.append(-1)
+            else: buffer.Parents.append(ringIdx[orfl.idx])
+        return
+
+def _VerticesOnEdges(pts, edges):
+    # True if any of pts lies on any of edges, sweeping both down the y axis
+    # with a heap of the edges spanning the current point's y ...
+    edges = sorted(edges, key = attrgetter('yTop'))
+    active = []
+    i = 0
+    for pt in sorted(pts, key = attrgetter('y')):
+        while i < len(edges) and edges[i].yTop <= pt.y:
+            e = edges[i]
+            heappush(active, (e.yBot, i, e))
+            i += 1
+        while active and active[0][0] < pt.y: heappop(active)
+        for _, _, e in active:
+            if _PointOnLineSegment(pt, Point(e.xBot, e.yBot), Point(e.xTop, e.yTop)):
+                return True
+    return False
+
 def PointClipper(subject, clip, typecombi, cliptype):
     if cliptype == "intersect":
         if typecombi == "pointline":
@@ -2461,3 +3336,22 @@ def SimplifyPolygons(polys, fillType):
     c.AddPolygons(polys, PolyType.Subject);
     c.Execute(ClipType.Union, result, fillType, fillType)
     return result
+
+def PolygonsIntersect(polys1, polys2, fillType = PolyFillType.EvenOdd):
+    c = Clipper()
+    c.AddPolygons(polys1, PolyType.Subject)
+    c.AddPolygons(polys2, PolyType.Clip)
+    return c.Intersects(fillType, fillType)
+
+def PolygonsContain(polys1, polys2, fillType = PolyFillType.EvenOdd):
+    # True if polys2 lies within polys1
+    c = Clipper()
+    c.AddPolygons(polys2, PolyType.Subject)
+    c.AddPolygons(polys1, PolyType.Clip)
+    return c.Within(fillType, fillType)
+
+def PolygonsTouch(polys1, polys2, fillType = PolyFillType.EvenOdd):
+    c = Clipper()
+    c.AddPolygons(polys1, PolyType.Subject)
+    c.AddPolygons(polys2, PolyType.Clip)
+    return c.Touches(fillType, fillType)
@@ -0,0 +1,397 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import clipper
+from clipper import Clipper, ClipType, PolyType, Point
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+SUBJECT = [[(0, 0), (100, 0), (100, 100), (0, 100)],
+    [(20, 20), (20, 80), (80, 80), (80, 20)]]
+CLIP = [[(50, -30), (130, 40), (60, 130), (-10, 60)]]
+FAR = [[(500, 500), (600, 500), (600, 600), (500, 600)]]
+
+def _Points(polys):
+    return [[Point(x, y) for x, y in poly] for poly in polys]
+
+def _Canonical(solution):
+    # rings as point tuples starting from their lowest point, sorted ...
+    rings = []
+    for ring in solution:
+        pts = [(pt.x, pt.y) for pt in ring]
+        i = pts.index(min(pts))
+        rings.append(pts[i:] + pts[:i])
+    return sorted(rings)
+
+def _Execute(clipType, subject = SUBJECT, clip = CLIP):
+    c = Clipper()
+    c.AddPolygons(_Points(subject), PolyType.Subject)
+    c.AddPolygons(_Points(clip), PolyType.Clip)
+    solution = []
+    assert c.Execute(clipType, solution)
+    return solution
+
+class ArithmeticTest(unittest.TestCase):
+
+    # (3,79)-(3,60) crosses (14,78)-(0,71) at y = 72.5, a rounding tie
+    TIE_SUBJECT = [[(3, 60), (3, 79), (-10, 79)]]
+    TIE_CLIP = [[(14, 78), (0, 71), (20, 60)]]
+
+    def tearDown(self):
+        clipper.UseDecimalArithmetic(False)
+
+    def _Edge(self, bot, top):
+        e = clipper.Edge()
+        e.xBot, e.yBot = e.xCurr, e.yCurr = bot
+        e.xTop, e.yTop = top
+        clipper._SetDx(e)
+        return e
+
+    def testTieArgumentOrder(self):
+        e1 = self._Edge((3, 79), (3, 60))
+        e2 = self._Edge((14, 78), (0, 71))
+        pt1, ok1 = clipper._IntersectPoint(e1, e2)
+        pt2, ok2 = clipper._IntersectPoint(e2, e1)
+        self.assertTrue(ok1 and ok2)
+        self.assertEqual(pt1, pt2)
+        clipper.UseDecimalArithmetic()
+        e1 = self._Edge((3, 79), (3, 60))
+        e2 = self._Edge((14, 78), (0, 71))
+        self.assertEqual(clipper._IntersectPoint(e1, e2), (pt1, True))
+
+    def testSameAsDecimal(self):
+        for subject, clip in ((self.TIE_SUBJECT, self.TIE_CLIP),
+                (self.TIE_CLIP, self.TIE_SUBJECT), (SUBJECT, CLIP)):
+            for clipType in range(4):
+                exact = _Execute(clipType, subject, clip)
+                clipper.UseDecimalArithmetic()
+                try: decimal = _Execute(clipType, subject, clip)
+                finally: clipper.UseDecimalArithmetic(False)
+                self.assertEqual(_Canonical(exact), _Canonical(decimal))
+
+class _AdjacencyCheckingClipper(Clipper):
+    # (each crossing must be between edges adjacent in the AEL)
+    adjacent = True
+
+    def _ProcessIntersectList(self):
+        while self._IntersectNodes is not None:
+            node = self._IntersectNodes
+            if node.e1.nextInAEL is not node.e2: self.adjacent = False
+            self._IntersectEdges(node.e1, node.e2, node.pt, clipper.Protects.Both)
+            self._SwapPositionsInAEL(node.e1, node.e2)
+            self._IntersectNodes = node.nextIn
+
+class IntersectOrderTest(unittest.TestCase):
+
+    def testEqualYOrder(self):
+        # several crossings at y = 5 and 6, taken in the old processing order
+        solution = _Execute(ClipType.Union, [[(1, 7), (4, 8), (12, 3), (12, 5)]],
+            [[(8, 7), (10, 11), (9, 1), (0, 4)]])
+        self.assertEqual(_Canonical(solution), [[(0, 4), (9, 1), (9, 5),
+            (12, 3), (12, 5), (9, 5), (10, 11), (8, 7), (6, 6), (7, 6),
+            (4, 8), (1, 7), (7, 6), (6, 6)]])
+
+    def testHatchAdjacent(self):
+        n = 20
+        subject = [(0, -1)]
+        for i in range(n): subject += [(2*i, 0), (2*i + 1, 60*n), (2*i + 2, 0)]
+        clip = [(-1, 0)]
+        for i in range(n): clip += [(0, 2*i), (60*n, 2*i + 1), (0, 2*i + 2)]
+        c = _AdjacencyCheckingClipper()
+        c.AddPolygon(_Points([subject])[0], PolyType.Subject)
+        c.AddPolygon(_Points([clip])[0], PolyType.Clip)
+        solution = []
+        self.assertTrue(c.Execute(ClipType.Intersection, solution))
+        self.assertTrue(c.adjacent)
+        self.assertTrue(len(solution) > n)
+
+class EdgeStoreTest(unittest.TestCase):
+
+    def testArrays(self):
+        c = Clipper()
+        c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+        c.AddPolygons(_Points(CLIP), PolyType.Clip)
+        edges = c._Edges
+        self.assertEqual(len(edges), 12)
+        self.assertEqual(edges.xBot.typecode, 'q')
+        self.assertEqual(list(edges.PolyType), [0] * 8 + [1] * 4)
+        for run in range(2):
+            solution = []
+            self.assertTrue(c.Execute(ClipType.Intersection, solution))
+            self.assertEqual(_Canonical(solution),
+                _Canonical(_Execute(ClipType.Intersection)))
+            self.assertEqual(edges.objects, {})
+
+    def testHugeCoordinates(self):
+        big = 10 ** 20
+        subject = [[(0, 0), (2 * big, 0), (2 * big, 2 * big), (0, 2 * big)]]
+        clip = [[(big, big), (3 * big, big), (3 * big, 3 * big), (big, 3 * big)]]
+        self.assertEqual(_Canonical(_Execute(ClipType.Intersection, subject, clip)),
+            [[(big, big), (2 * big, big), (2 * big, 2 * big), (big, 2 * big)]])
+
+class BufferInputTest(unittest.TestCase):
+
+    def _Flat(self, polys):
+        coords, offsets = [], [0]
+        for poly in polys:
+            for x, y in poly: coords.extend((x, y))
+            offsets.append(len(coords) // 2)
+        return coords, offsets
+
+    def testFlatBuffer(self):
+        c = Clipper()
+        coords, offsets = self._Flat(SUBJECT)
+        self.assertTrue(c.AddPolygonsFromBuffer(coords, offsets, PolyType.Subject))
+        c.AddPolygons(_Points(CLIP), PolyType.Clip)
+        solution = []
+        self.assertTrue(c.Execute(ClipType.Intersection, solution))
+        self.assertEqual(_Canonical(solution),
+            _Canonical(_Execute(ClipType.Intersection)))
+
+    @unittest.skipIf(numpy is None, "needs numpy")
+    def testNumpyBuffer(self):
+        c = Clipper()
+        coords, offsets = self._Flat(SUBJECT)
+        c.AddPolygonsFromBuffer(numpy.array(coords).reshape(-1, 2), offsets,
+            PolyType.Subject)
+        c.AddPolygon(numpy.array(CLIP[0]), PolyType.Clip)
+        solution = []
+        self.assertTrue(c.Execute(ClipType.Difference, solution))
+        self.assertEqual(_Canonical(solution),
+            _Canonical(_Execute(ClipType.Difference)))
+
+    def testOffsetsRange(self):
+        # offsets needn't start at 0 nor end at the last point
+        coords, offsets = self._Flat(SUBJECT)
+        buffers = [coords]
+        if numpy is not None: buffers.append(numpy.array(coords).reshape(-1, 2))
+        for buf in buffers:
+            for polys, offs in (([SUBJECT[1]], offsets[1:]),
+                ([SUBJECT[0]], offsets[:2])):
+                c = Clipper()
+                self.assertTrue(c.AddPolygonsFromBuffer(buf, offs, PolyType.Subject))
+                c.AddPolygons(_Points(CLIP), PolyType.Clip)
+                solution = []
+                self.assertTrue(c.Execute(ClipType.Intersection, solution))
+                self.assertEqual(_Canonical(solution),
+                    _Canonical(_Execute(ClipType.Intersection, polys)))
+            for offs in ([0, 9], [4, 2, 8], [-1, 4]):
+                self.assertRaises(ValueError, Clipper().AddPolygonsFromBuffer,
+                    buf, offs, PolyType.Subject)
+
+    @unittest.skipIf(numpy is None, "needs numpy")
+    def testFloatArrayRejected(self):
+        c = Clipper()
+        self.assertRaises(TypeError, c.AddPolygon,
+            numpy.array(CLIP[0], dtype = float), PolyType.Clip)
+
+    @unittest.skipIf(numpy is None, "needs numpy")
+    def testHugeValues(self):
+        big = 1 << 62
+        poly = [(0, 0), (big, 0), (big, big), (0, big)]
+        c = Clipper()
+        self.assertTrue(c.AddPolygon(numpy.array(poly, dtype = numpy.uint64),
+            PolyType.Subject))
+        solution = []
+        self.assertTrue(c.Execute(ClipType.Union, solution))
+        self.assertEqual(_Canonical(solution),
+            _Canonical(_Execute(ClipType.Union, [poly], [])))
+
+    @unittest.skipIf(numpy is None, "needs numpy")
+    def testFloatPointsOverflow(self):
+        pts = clipper.FloatPoints2IntPoints(numpy.array([[1e20, 0.5], [0, 1]]))
+        self.assertEqual(pts.tolist(),
+            [[int(1e20 * clipper.PRECISION), 500000000], [0, 1000000000]])
+        self.assertRaises(ValueError, clipper.FloatPoints2IntPoints,
+            numpy.array([[float('nan'), 0.0]]))
+
+class ExecuteStatsTest(unittest.TestCase):
+
+    def testSameOutput(self):
+        for clipType in range(4):
+            c = Clipper()
+            c.CollectStats = True
+            c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+            c.AddPolygons(_Points(CLIP), PolyType.Clip)
+            solution = []
+            self.assertTrue(c.Execute(clipType, solution))
+            self.assertEqual(_Canonical(solution), 
+                _Canonical(_Execute(clipType)))
+            self.assertTrue(c.Stats.Scanbeams > 0)
+            self.assertTrue(c.Stats.OutRecs >= len(solution))
+            self.assertTrue(c.Stats.TotalTime >= c.Stats.IntersectionsTime)
+
+class ExecuteManyTest(unittest.TestCase):
+
+    def testSameAsExecute(self):
+        c = Clipper()
+        c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+        c.AddPolygons(_Points(CLIP), PolyType.Clip)
+        clipTypes = [ClipType.Intersection, ClipType.Union,
+            ClipType.Difference, ClipType.Xor]
+        solutions = [[] for clipType in clipTypes]
+        self.assertTrue(c.ExecuteMany(clipTypes, solutions))
+        for clipType, solution in zip(clipTypes, solutions):
+            self.assertEqual(_Canonical(solution),
+                _Canonical(_Execute(clipType)))
+
+    def testCulledPolygons(self):
+        # the far clip polygon is culled for the intersection only, its
+        # scanbeams round the crossings of the others differently
+        subject = [[(49, 64), (38, 73), (63, 15)]]
+        clip = [[(11, 85), (143, -47), (34, 51)],
+            [(173, 0), (184, 0), (226, 30), (171, 30)]]
+        c = Clipper()
+        c.AddPolygons(_Points(subject), PolyType.Subject)
+        c.AddPolygons(_Points(clip), PolyType.Clip)
+        clipTypes = [ClipType.Xor, ClipType.Intersection, ClipType.Union]
+        solutions = [[] for clipType in clipTypes]
+        self.assertTrue(c.ExecuteMany(clipTypes, solutions))
+        for clipType, solution in zip(clipTypes, solutions):
+            self.assertEqual(_Canonical(solution),
+                _Canonical(_Execute(clipType, subject, clip)))
+
+    def testLengthMismatch(self):
+        c = Clipper()
+        c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+        c.AddPolygons(_Points(CLIP), PolyType.Clip)
+        solution = [(0, 0)]
+        self.assertFalse(c.ExecuteMany(
+            [ClipType.Intersection, ClipType.Union], [solution]))
+        self.assertEqual(solution, [(0, 0)])
+
+class ExecuteAreaTest(unittest.TestCase):
+
+    def _Clipper(self, subject = SUBJECT, clip = CLIP):
+        c = Clipper()
+        c.AddPolygons(_Points(subject), PolyType.Subject)
+        c.AddPolygons(_Points(clip), PolyType.Clip)
+        return c
+
+    def _Centroid(self, solution):
+        area = cx = cy = 0
+        for ring in solution:
+            for pt1, pt2 in zip(ring, ring[1:] + ring[:1]):
+                cross = pt1.x * pt2.y - pt2.x * pt1.y
+                area += cross
+                cx += (pt1.x + pt2.x) * cross
+                cy += (pt1.y + pt2.y) * cross
+        if area == 0: return 0.0, None
+        return area / 2.0, (cx / (3.0 * area), cy / (3.0 * area))
+
+    def testSameAsExecute(self):
+        # (the second pair shares an edge, so Execute has to join polygons)
+        pairs = [(SUBJECT, CLIP),
+            ([[(0, 0), (10, 0), (10, 10), (0, 10)]],
+             [[(10, 0), (20, 0), (20, 10), (10, 10)]])]
+        for subject, clip in pairs:
+            for clipType in range(4):
+                solution = _Execute(clipType, subject, clip)
+                area = sum(clipper.Area(ring) for ring in solution)
+                self.assertAlmostEqual(
+                    self._Clipper(subject, clip).ExecuteArea(clipType), area)
+                a, centroid = self._Clipper(subject, clip).ExecuteCentroid(clipType)
+                expectedArea, expected = self._Centroid(solution)
+                self.assertAlmostEqual(a, expectedArea)
+                if expected is None: self.assertIsNone(centroid)
+                else:
+                    self.assertAlmostEqual(centroid.x, expected[0])
+                    self.assertAlmostEqual(centroid.y, expected[1])
+
+    def testEmpty(self):
+        c = self._Clipper(SUBJECT, FAR)
+        self.assertEqual(c.ExecuteArea(ClipType.Intersection), 0)
+        self.assertEqual(c.ExecuteCentroid(ClipType.Intersection), (0.0, None))
+
+class PreparedPolygonsTest(unittest.TestCase):
+
+    def testSameAsExecute(self):
+        prepared = clipper.PreparedPolygons(_Points(SUBJECT))
+        for clipType in range(4):
+            # (the same prepared set is reused by each Clipper)
+            c = Clipper()
+            self.assertTrue(c.AddPrepared(prepared))
+            c.AddPolygons(_Points(CLIP), PolyType.Clip)
+            solution = []
+            self.assertTrue(c.Execute(clipType, solution))
+            self.assertEqual(_Canonical(solution),
+                _Canonical(_Execute(clipType)))
+
+    def testPreparedClip(self):
+        c = Clipper()
+        c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+        c.AddPrepared(clipper.PreparedPolygons(_Points(CLIP), PolyType.Clip))
+        solution = []
+        self.assertTrue(c.Execute(ClipType.Difference, solution))
+        self.assertEqual(_Canonical(solution),
+            _Canonical(_Execute(ClipType.Difference)))
+
+    def testEmpty(self):
+        self.assertFalse(Clipper().AddPrepared(clipper.PreparedPolygons()))
+
+class ExecuteToBufferTest(unittest.TestCase):
+
+    def testSameAsExecute(self):
+        for clipType in range(4):
+            c = Clipper()
+            c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+            c.AddPolygons(_Points(CLIP), PolyType.Clip)
+            buffer = clipper.PolygonBuffer()
+            self.assertTrue(c.ExecuteToBuffer(clipType, buffer))
+            rings = [buffer.GetRing(i) for i in range(buffer.RingCount())]
+            self.assertEqual(_Canonical(rings), _Canonical(_Execute(clipType)))
+            self.assertEqual(buffer.Offsets[-1] * 2, len(buffer.Coords))
+            for i, ring in enumerate(rings):
+                self.assertEqual(buffer.IsHole(i), not clipper.Orientation(ring))
+
+    def testNesting(self):
+        c = Clipper()
+        c.AddPolygons(_Points(SUBJECT), PolyType.Subject)
+        buffer = clipper.PolygonBuffer()
+        self.assertTrue(c.ExecuteToBuffer(ClipType.Union, buffer))
+        self.assertEqual(buffer.RingCount(), 2)
+        outer = [i for i in range(2) if buffer.Parents[i] < 0]
+        self.assertEqual(len(outer), 1)
+        self.assertEqual(buffer.Parents[1 - outer[0]], outer[0])
+
+class PredicateTest(unittest.TestCase):
+
+    SQUARE = [[(0, 0), (10, 0), (10, 10), (0, 10)]]
+    NEXT = [[(10, 0), (20, 0), (20, 10), (10, 10)]]
+    INSIDE = [[(5, 5), (15, 5), (15, 15), (5, 15)]]
+    IN_HOLE = [[(30, 30), (40, 30), (40, 40), (30, 40)]]
+
+    def _Clipper(self, subject, clip):
+        c = Clipper()
+        c.AddPolygons(_Points(subject), PolyType.Subject)
+        c.AddPolygons(_Points(clip), PolyType.Clip)
+        return c
+
+    def testSameAsExecute(self):
+        pairs = [(SUBJECT, CLIP), (SUBJECT, FAR), (self.SQUARE, self.NEXT),
+            (self.INSIDE, SUBJECT), (self.IN_HOLE, SUBJECT), (CLIP, SUBJECT)]
+        for subject, clip in pairs:
+            intersects = len(_Execute(ClipType.Intersection, subject, clip)) > 0
+            within = len(_Execute(ClipType.Difference, subject, clip)) == 0
+            self.assertEqual(self._Clipper(subject, clip).Intersects(), intersects)
+            self.assertEqual(self._Clipper(subject, clip).Within(), within)
+
+    def testWithin(self):
+        self.assertTrue(self._Clipper(self.INSIDE, SUBJECT).Within())
+        self.assertFalse(self._Clipper(SUBJECT, self.INSIDE).Within())
+        self.assertFalse(self._Clipper(self.IN_HOLE, SUBJECT).Within())
+
+    def testTouches(self):
+        self.assertTrue(self._Clipper(self.SQUARE, self.NEXT).Touches())
+        self.assertFalse(self._Clipper(self.SQUARE, self.NEXT).Intersects())
+        self.assertFalse(self._Clipper(SUBJECT, CLIP).Touches())
+        self.assertFalse(self._Clipper(SUBJECT, FAR).Touches())
+        self.assertFalse(self._Clipper(self.IN_HOLE, SUBJECT).Touches())
+
+if __name__ == '__main__':
+    unittest.main()